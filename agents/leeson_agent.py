@@ -1,11 +1,80 @@
 """Base class for Leeson trading agents.
 
 Communicates with the Rust TUI over JSON-lines on stdin/stdout.
-Uses only the standard library — no third-party dependencies.
+Uses only the standard library — no third-party dependencies. When
+``orjson`` is installed it is used for JSON encoding and decoding.
 """
 
 import json
+import os
 import sys
+import threading
+import time
+from collections.abc import Callable
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def _dumps(obj: object) -> bytes:
+    """Encode an object as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _dumps_line(obj: object) -> bytes:
+    """Encode an object as a single newline-terminated JSON line."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj) + "\n").encode()
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Bytes requested per stdin read; one read usually drains a whole burst.
+READ_SIZE = 65536
+
+# Delay before flushing buffered output, so bursts share one write.
+FLUSH_INTERVAL = 0.002  # seconds
+
+# Returned by a dispatch handler to end the main loop.
+_STOP = object()
+
+_READY_LINE = b'{"type":"ready"}\n'
+_ERROR_PREFIX = b'{"type":"error","message":'
+
+# Inbound message type → the ``on_*`` callback that handles it.
+_CALLBACKS = {
+    "user_message": "on_message",
+    "execution_update": "on_execution",
+    "ticker_update": "on_ticker",
+    "trade_update": "on_trade",
+    "balance_update": "on_balance",
+    "order_response": "on_order_response",
+    "risk_limits": "on_risk_limits",
+    "token_state": "on_token_state",
+}
+
+# The TUI serializes the ``type`` tag first in every compact JSON line.
+_TYPE_PREFIX = b'{"type":"'
+
+
+def _peek_type(raw: bytes) -> str | None:
+    """Read the message type from a JSON line without parsing the rest.
+
+    Returns None if the line does not start with the TUI's ``type`` tag,
+    in which case the caller should fall back to a full parse.
+    """
+    if not raw.startswith(_TYPE_PREFIX):
+        return None
+    start = len(_TYPE_PREFIX)
+    end = raw.find(b'"', start)
+    if end < 0:
+        return None
+    return raw[start:end].decode()
 
 
 class Agent:
@@ -18,21 +87,62 @@ class Agent:
 
     def __init__(self, agent_index: int) -> None:
         self.agent_index = agent_index
+        self._out = sys.stdout.buffer
+        self._out_lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+        # Pre-encoded ``output`` envelope prefix per target panel.
+        self._out_prefixes: dict[int, bytes] = {}
+        # Inbound message type → handler. Returning ``_STOP`` ends ``run``.
+        self._dispatch: dict[str, Callable[[dict], object]] = {
+            "user_message": lambda m: self.on_message(m.get("content", "")),
+            "execution_update": lambda m: self.on_execution(m.get("data", [])),
+            "ticker_update": lambda m: self.on_ticker(m.get("data", {})),
+            "trade_update": lambda m: self.on_trade(m.get("data", [])),
+            "balance_update": lambda m: self.on_balance(m.get("data", [])),
+            "order_response": lambda m: self.on_order_response(
+                success=m.get("success", False),
+                order_id=m.get("order_id"),
+                cl_ord_id=m.get("cl_ord_id"),
+                order_userref=m.get("order_userref"),
+                error=m.get("error"),
+            ),
+            "risk_limits": lambda m: self.on_risk_limits(m.get("description", "")),
+            "token_state": lambda m: self.on_token_state(m.get("state", "")),
+            "shutdown": self._handle_shutdown,
+        }
+        # Types whose callback the subclass left as the no-op default are
+        # dropped, so their lines are skipped before decoding.
+        for msg_type, name in _CALLBACKS.items():
+            if getattr(type(self), name) is getattr(Agent, name):
+                del self._dispatch[msg_type]
 
     # -- Outbound messages (agent → TUI) --
 
     def output(self, line: str, panel: int | None = None) -> None:
         """Write a line to an agent output panel in the TUI."""
         target = panel if panel is not None else self.agent_index
-        self._send({"type": "output", "agent": target, "line": line})
+        prefix = self._out_prefixes.get(target)
+        if prefix is None:
+            prefix = b'{"type":"output","agent":%d,"line":' % target
+            self._out_prefixes[target] = prefix
+        self._write(prefix + _dumps(line) + b"}\n")
 
     def error(self, message: str) -> None:
         """Report an error to the TUI."""
-        self._send({"type": "error", "message": message})
+        self._write(_ERROR_PREFIX + _dumps(message) + b"}\n")
 
     def ready(self) -> None:
         """Signal that the agent is ready to receive messages."""
-        self._send({"type": "ready"})
+        self._write(_READY_LINE)
+        self.flush()
+
+    def flush(self) -> None:
+        """Write any buffered output to the TUI immediately."""
+        with self._out_lock:
+            self._dirty.clear()
+            self._out.flush()
 
     def place_order(
         self,
@@ -96,49 +206,74 @@ class Agent:
     # -- Main loop --
 
     def run(self) -> None:
-        """Read JSON-lines from stdin and dispatch to handlers."""
+        """Read JSON-lines from stdin and dispatch to handlers.
+
+        Stdin is read in large chunks and split into lines here, so a
+        burst of messages is handled per read and output is flushed once
+        per drained chunk.
+        """
         self.ready()
+        stdin = sys.stdin.buffer.fileno()
+        pending = b""
         try:
-            for raw in sys.stdin:
-                raw = raw.strip()
-                if not raw:
-                    continue
-                try:
-                    msg = json.loads(raw)
-                except json.JSONDecodeError:
-                    continue
-                msg_type = msg.get("type")
-                if msg_type == "user_message":
-                    self.on_message(msg.get("content", ""))
-                elif msg_type == "execution_update":
-                    self.on_execution(msg.get("data", []))
-                elif msg_type == "ticker_update":
-                    self.on_ticker(msg.get("data", {}))
-                elif msg_type == "trade_update":
-                    self.on_trade(msg.get("data", []))
-                elif msg_type == "balance_update":
-                    self.on_balance(msg.get("data", []))
-                elif msg_type == "order_response":
-                    self.on_order_response(
-                        success=msg.get("success", False),
-                        order_id=msg.get("order_id"),
-                        cl_ord_id=msg.get("cl_ord_id"),
-                        order_userref=msg.get("order_userref"),
-                        error=msg.get("error"),
-                    )
-                elif msg_type == "risk_limits":
-                    self.on_risk_limits(msg.get("description", ""))
-                elif msg_type == "token_state":
-                    self.on_token_state(msg.get("state", ""))
-                elif msg_type == "shutdown":
-                    self.on_shutdown()
-                    break
+            while chunk := os.read(stdin, READ_SIZE):
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for raw in lines:
+                    if self._handle_line(raw) is _STOP:
+                        return
+                self.flush()
+            if pending:
+                self._handle_line(pending)
         except KeyboardInterrupt:
             pass
+        finally:
+            self.flush()
 
     # -- Internal --
 
+    def _handle_line(self, raw: bytes) -> object:
+        """Decode one JSON line and dispatch it, returning the handler's result."""
+        raw = raw.strip()
+        if not raw:
+            return None
+        msg_type = _peek_type(raw)
+        if msg_type is not None and msg_type not in self._dispatch:
+            return None  # no handler, skip decoding the payload
+        try:
+            msg = _loads(raw)
+        except json.JSONDecodeError:  # orjson's error subclasses it
+            return None
+        handler = self._dispatch.get(msg.get("type"))
+        if handler is None:
+            return None
+        return handler(msg)
+
+    def _handle_shutdown(self, msg: dict) -> object:
+        """Run the shutdown hook and stop the main loop."""
+        self.on_shutdown()
+        return _STOP
+
     def _send(self, obj: dict) -> None:
         """Write a JSON object as a single line to stdout."""
-        sys.stdout.write(json.dumps(obj) + "\n")
-        sys.stdout.flush()
+        self._write(_dumps_line(obj))
+
+    def _write(self, buf: bytes) -> None:
+        """Append an encoded line to the buffered stdout.
+
+        The line is flushed by the background flusher shortly after, so
+        a burst of messages goes out in a single write.
+        """
+        with self._out_lock:
+            self._out.write(buf)
+        self._dirty.set()
+
+    def _flush_loop(self) -> None:
+        """Flush buffered output shortly after it is written."""
+        while True:
+            self._dirty.wait()
+            time.sleep(FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except (BrokenPipeError, ValueError):
+                return
@@ -4,28 +4,79 @@ Spawned by the Rust TUI as a subprocess. Communicates via JSON-lines
 on stdin/stdout.
 
 Usage: python -m multi_agent
+
+Set LEESON_UVLOOP=1 to run on uvloop's libuv-based event loop when it
+is installed. The stdin bridge's pipe transport and reader thread work
+on either loop; the stock asyncio loop stays the default until uvloop
+has been validated against the TUI.
+
+Errors are logged to stderr (stdout carries the TUI protocol) by a
+background thread, so formatting tracebacks never blocks the event loop.
+
+Set LEESON_LOGFIRE=1 to also instrument pydantic-ai and httpx calls with
+Logfire spans. Instrumentation wraps every tool call and HTTP request,
+so it is off by default.
 """
 
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 
 import logfire
 
 from multi_agent import orchestrator
 
+try:
+    import uvloop
+except ImportError:  # optional speedup
+    uvloop = None
+
 logfire.configure(
     service_name='leeson-agents',
     send_to_logfire='if-token-present',
     console=False,
 )
-logfire.instrument_pydantic_ai()
-logfire.instrument_httpx()
+if os.getenv("LEESON_LOGFIRE"):
+    logfire.instrument_pydantic_ai()
+    logfire.instrument_httpx()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records unformatted; the listener thread formats them.
+
+    The stock ``prepare`` renders the message and traceback in the
+    calling thread so records can be pickled. These never leave the
+    process, so that work is left to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _start_logging() -> QueueListener:
+    """Route all logging through a queue drained by a stderr thread."""
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stderr = logging.StreamHandler(sys.stderr)
+    stderr.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    logging.getLogger().addHandler(_DeferredQueueHandler(records))
+    listener = QueueListener(records, stderr)
+    listener.start()
+    return listener
 
 
 def main() -> None:
-    loop = asyncio.new_event_loop()
+    listener = _start_logging()
+    if uvloop is not None and os.getenv("LEESON_UVLOOP"):
+        loop = uvloop.new_event_loop()
+    else:
+        loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
         loop.run_until_complete(orchestrator.run(loop))
@@ -33,6 +84,7 @@ def main() -> None:
         pass
     finally:
         loop.close()
+        listener.stop()
         logfire.shutdown()
 
 
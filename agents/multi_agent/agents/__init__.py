@@ -1 +1,25 @@
 """Agent definitions for the multi-agent trading system."""
+
+from __future__ import annotations
+
+
+def init_agents(model: object) -> None:
+    """Bind the shared LLM model to every agent.
+
+    Agents are built at import time with ``model=None`` because the
+    Fireworks key is only available at runtime; call this once after
+    :func:`multi_agent.llm.create_model` so runs need not pass a model.
+    """
+    from multi_agent.agents import (
+        execution_agent,
+        ideation_agent,
+        market_agent,
+        risk_agent,
+        user_agent,
+    )
+
+    execution_agent.execution_agent.model = model
+    ideation_agent.ideation_agent.model = model
+    market_agent.market_agent.model = model
+    risk_agent.risk_agent.model = model
+    user_agent.user_agent.model = model
@@ -20,6 +20,21 @@ from multi_agent.models import (
 
 PANEL = 2
 
+_APPROVED_PROMPT = (
+    "Execute this approved order exactly as specified:\n"
+    "Symbol: {0.symbol}, Side: {0.side}, Type: {0.order_type}\n"
+    "Qty: {0.qty}, Price: {0.price}\n"
+    "Reason: {0.reason}\n\n"
+    "Use the place_order tool with these exact parameters."
+).format
+
+_CLOSE_PROMPT = (
+    "Close this position exactly as specified:\n"
+    "Symbol: {0.symbol}, Side: {0.side}, Qty: {0.qty}\n"
+    "Reason: {0.reason}\n\n"
+    "Use the place_order tool with order_type='market'."
+).format
+
 execution_agent = Agent(
     model=None,
     defer_model_check=True,
@@ -106,7 +121,7 @@ async def report_order_result(
 
 
 async def run_on_approved_order(
-    deps: AgentDeps, order: ApprovedOrder, *, model: object
+    deps: AgentDeps, order: ApprovedOrder
 ) -> None:
     """Execute an approved order from Risk Agent."""
     output_to_panel(
@@ -114,34 +129,23 @@ async def run_on_approved_order(
         f"[exec] Executing: {order.symbol} {order.side} {order.order_type} "
         f"qty={order.qty} price={order.price or 'market'}",
     )
-    prompt = (
-        f"Execute this approved order exactly as specified:\n"
-        f"Symbol: {order.symbol}, Side: {order.side}, Type: {order.order_type}\n"
-        f"Qty: {order.qty}, Price: {order.price}\n"
-        f"Reason: {order.reason}\n\n"
-        f"Use the place_order tool with these exact parameters."
-    )
+    prompt = _APPROVED_PROMPT(order)
     await run_agent_streamed(
-        execution_agent, prompt, deps=deps, model=model, panel=PANEL
+        execution_agent, prompt, deps=deps, panel=PANEL
     )
 
 
 async def run_on_close_position(
-    deps: AgentDeps, close: ClosePosition, *, model: object
+    deps: AgentDeps, close: ClosePosition
 ) -> None:
     """Execute a position close from Risk Agent."""
     output_to_panel(
         PANEL,
         f"[exec] Closing: {close.symbol} {close.side} qty={close.qty}",
     )
-    prompt = (
-        f"Close this position exactly as specified:\n"
-        f"Symbol: {close.symbol}, Side: {close.side}, Qty: {close.qty}\n"
-        f"Reason: {close.reason}\n\n"
-        f"Use the place_order tool with order_type='market'."
-    )
+    prompt = _CLOSE_PROMPT(close)
     await run_agent_streamed(
-        execution_agent, prompt, deps=deps, model=model, panel=PANEL
+        execution_agent, prompt, deps=deps, panel=PANEL
     )
 
 
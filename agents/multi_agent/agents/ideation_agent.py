@@ -9,11 +9,21 @@ through the same approval flow as the Market Agent.
 from __future__ import annotations
 
 import asyncio
-from datetime import UTC, datetime
+import functools
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 import httpx
 from pydantic_ai import Agent, RunContext
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
 from multi_agent.bridge import output_to_panel
 from multi_agent.models import (
     AgentDeps,
@@ -22,14 +32,75 @@ from multi_agent.models import (
     run_agent_streamed,
     validate_trade_idea,
 )
-from multi_agent.technical import compute_all, find_key_levels, parse_candles
+from multi_agent.technical import (
+    CandleSeries,
+    compute_all,
+    find_key_levels,
+    merge_series,
+    parse_series,
+)
+
+if TYPE_CHECKING:
+    from multi_agent.state import SharedState
 
 PANEL = 1
 
-_KRAKEN_OHLC_URL = "https://api.kraken.com/0/public/OHLC"
-_VALID_INTERVALS = {1, 5, 15, 30, 60, 240, 1440, 10080, 21600}
+# Ticker and position lines shared by the context block and pulse prompt.
+_TICKER_FMT = "  %s: last=%s bid=%s ask=%s vol=%s"
+_POS_FMT = "  %s %s qty=%s entry=%s current=%s pnl=%s"
 
+_json_loads = orjson.loads if orjson is not None else json.loads
 
+_KRAKEN_OHLC_URL = "https://api.kraken.com/0/public/OHLC"
+_VALID_INTERVALS_SORTED = (1, 5, 15, 30, 60, 240, 1440, 10080, 21600)
+_VALID_INTERVALS: frozenset[int] = frozenset(_VALID_INTERVALS_SORTED)
+_INVALID_INTERVAL_MSG = f". Valid intervals: {list(_VALID_INTERVALS_SORTED)}"
+
+# Kraken keys legacy pairs by their X/Z-prefixed names in OHLC results;
+# newer pairs use the REST name as-is.
+_KRAKEN_RESULT_KEYS = {
+    "BTCUSD": "XXBTZUSD",
+    "BTCEUR": "XXBTZEUR",
+    "ETHUSD": "XETHZUSD",
+    "ETHEUR": "XETHZEUR",
+    "LTCUSD": "XLTCZUSD",
+    "XRPUSD": "XXRPZUSD",
+}
+
+# One OHLC table row: time, open, high, low, close, volume.
+_ROW_FMT = "{:<20} | {:>10.1f} | {:>10.1f} | {:>10.1f} | {:>10.1f} | {:>10.2f}".format
+
+# Shared client so repeated OHLC fetches reuse keep-alive TCP/TLS connections.
+_client: httpx.AsyncClient | None = None
+_client_lock = asyncio.Lock()
+# Caps concurrent Kraken requests so a wide watchlist stays under the
+# public API's per-IP rate limit.
+_RATE_LIMIT = asyncio.Semaphore(8)
+
+
+@dataclass(slots=True)
+class _CachedOhlc:
+    """A successful OHLC fetch, parsed into columns once on arrival."""
+
+    fetched_at: float
+    series: CandleSeries
+    # Derived views, built on first use and shared by every tool call and
+    # periodic cycle that hits this entry.
+    tables: dict[str, str] = field(default_factory=dict)
+    indicators: str | None = None
+    levels: dict[str, list[float]] | None = None
+
+
+# Successful fetches keyed by (REST pair, interval, window), reused for a
+# quarter of the candle interval. ``window`` is the number of recent candles
+# requested, or None for Kraken's full 720. Concurrent fetches of the same
+# key await one shared in-flight request.
+_OhlcKey = tuple[str, int, int | None]
+_OHLC_CACHE: dict[_OhlcKey, _CachedOhlc] = {}
+_OHLC_INFLIGHT: dict[_OhlcKey, asyncio.Task] = {}
+
+
+@functools.lru_cache(maxsize=128)
 def _ws_pair_to_rest(symbol: str) -> str:
     """Convert WebSocket pair format to REST format ('BTC/USD' → 'BTCUSD')."""
     return symbol.replace("/", "")
@@ -40,29 +111,94 @@ def _ws_pair_to_rest(symbol: str) -> str:
 # ---------------------------------------------------------------------------
 
 
-async def _fetch_raw_ohlc(
-    symbol: str, interval: int = 60
-) -> list[list] | str:
-    """Fetch raw OHLC candle arrays from Kraken.
+async def _get_client() -> httpx.AsyncClient:
+    """Return the shared Kraken HTTP client, creating it on first use."""
+    global _client
+    if _client is not None:
+        return _client
+    async with _client_lock:
+        if _client is None:
+            _client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=16),
+            )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared Kraken HTTP client. Called on shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _fresh_entry(key: _OhlcKey) -> _CachedOhlc | None:
+    """Return the cached entry for *key* if it is still within its TTL."""
+    cached = _OHLC_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached.fetched_at < key[1] * 15:
+        return cached
+    return None
+
+
+async def _fetch_ohlc(
+    symbol: str, interval: int = 60, window: int | None = None
+) -> _CachedOhlc | str:
+    """Fetch OHLC candles from Kraken.
 
-    Returns the raw list of candle arrays on success, or an error string.
+    With *window*, only roughly the last ``window`` candles are requested
+    (via Kraken's ``since``) unless a fresh full fetch is already cached.
+
+    Returns the cache entry holding the parsed candles on success, or an
+    error string. Results are cached per (pair, interval, window) for
+    ``interval * 60 / 4`` seconds and concurrent callers share a single
+    request.
     """
     if interval not in _VALID_INTERVALS:
-        return (
-            f"Invalid interval {interval}. "
-            f"Valid intervals: {sorted(_VALID_INTERVALS)}"
-        )
+        return f"Invalid interval {interval}{_INVALID_INTERVAL_MSG}"
 
     rest_pair = _ws_pair_to_rest(symbol)
+    cached = _fresh_entry((rest_pair, interval, None))
+    if cached is None and window is not None:
+        cached = _fresh_entry((rest_pair, interval, window))
+    if cached is not None:
+        return cached
+
+    key = (rest_pair, interval, window)
+    task = _OHLC_INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(_request_ohlc(symbol, *key))
+        _OHLC_INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _OHLC_INFLIGHT.pop(key, None))
+    # Shield so one cancelled caller does not cancel the shared request.
+    return await asyncio.shield(task)
+
+
+async def _request_ohlc(
+    symbol: str, rest_pair: str, interval: int, window: int | None
+) -> _CachedOhlc | str:
+    """Perform the Kraken OHLC request and cache a successful result.
+
+    A stale full entry is refreshed incrementally: only candles from one
+    interval before its last one are requested and merged onto it.
+    """
+    params = {"pair": rest_pair, "interval": interval}
+    previous = None
+    if window is not None:
+        # One spare interval so the still-forming candle does not shrink
+        # the window below ``window`` closed candles.
+        params["since"] = int(time.time()) - (window + 1) * interval * 60
+    else:
+        previous = _OHLC_CACHE.get((rest_pair, interval, None))
+        if previous is not None and previous.series.time:
+            params["since"] = previous.series.time[-1] - interval * 60
 
+    client = await _get_client()
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                _KRAKEN_OHLC_URL,
-                params={"pair": rest_pair, "interval": interval},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        async with _RATE_LIMIT:
+            resp = await client.get(_KRAKEN_OHLC_URL, params=params)
+        resp.raise_for_status()
+        data = _json_loads(resp.content)
     except httpx.HTTPStatusError as exc:
         return f"Kraken API error: HTTP {exc.response.status_code}"
     except httpx.RequestError as exc:
@@ -73,28 +209,43 @@ async def _fetch_raw_ohlc(
         return f"Kraken API error: {', '.join(errors)}"
 
     result = data.get("result", {})
-    for key, value in result.items():
-        if key != "last" and isinstance(value, list):
-            return value
+    candles = result.get(_KRAKEN_RESULT_KEYS.get(rest_pair, rest_pair))
+    if candles is None:
+        # Unknown result key: the only entry besides "last" is the candles.
+        result.pop("last", None)
+        candles = next(iter(result.values()), None)
+    if candles is not None:
+        series = parse_series(candles)
+        if previous is not None:
+            series = merge_series(previous.series, series)
+        # A new entry, so tables and indicators are rebuilt from the merge.
+        entry = _CachedOhlc(time.monotonic(), series)
+        _OHLC_CACHE[rest_pair, interval, window] = entry
+        return entry
 
     return f"No OHLC data returned for {symbol}"
 
 
-def _format_ohlc(symbol: str, raw_candles: list[list], interval: int = 60) -> str:
-    """Format raw candle arrays into the 24-candle summary table."""
-    total = len(raw_candles)
-    recent = raw_candles[-24:] if total >= 24 else raw_candles
-
-    first_close = float(recent[0][4])
-    last_close = float(recent[-1][4])
-    period_high = max(float(c[2]) for c in recent)
-    period_low = min(float(c[3]) for c in recent)
-    total_volume = sum(float(c[6]) for c in recent)
+def _format_ohlc(symbol: str, series: CandleSeries, interval: int = 60) -> str:
+    """Format parsed candles into the 24-candle summary table."""
+    # Project only the columns the table shows, over the last 24 candles.
+    times = series.time[-24:]
+    opens = series.open[-24:]
+    highs = series.high[-24:]
+    lows = series.low[-24:]
+    closes = series.close[-24:]
+    volumes = series.volume[-24:]
+
+    first_close = closes[0]
+    last_close = closes[-1]
+    period_high = max(highs)
+    period_low = min(lows)
+    total_volume = sum(volumes)
     change = last_close - first_close
     change_pct = (change / first_close * 100) if first_close else 0
 
     lines = [
-        f"OHLC for {symbol} (interval={interval}min, {total} candles available)",
+        f"OHLC for {symbol} (interval={interval}min, showing last {len(times)} candles)",
         f"Latest close: {last_close}  |  Period high: {period_high}  |  Period low: {period_low}",
         f"24-candle change: {change:+.2f} ({change_pct:+.2f}%)  |  Total volume: {total_volume:.2f}",
         "",
@@ -103,95 +254,134 @@ def _format_ohlc(symbol: str, raw_candles: list[list], interval: int = 60) -> st
         "-" * 85,
     ]
 
-    for c in recent:
-        ts = datetime.fromtimestamp(int(c[0]), tz=UTC).strftime("%Y-%m-%d %H:%M")
-        lines.append(
-            f"{ts:<20} | {float(c[1]):>10.1f} | {float(c[2]):>10.1f} | "
-            f"{float(c[3]):>10.1f} | {float(c[4]):>10.1f} | {float(c[6]):>10.2f}"
-        )
+    lines.extend(
+        _ROW_FMT(time.strftime("%Y-%m-%d %H:%M", time.gmtime(t)), o, h, lo, c, v)
+        for t, o, h, lo, c, v in zip(times, opens, highs, lows, closes, volumes)
+    )
 
     return "\n".join(lines)
 
 
+def _cached_table(entry: _CachedOhlc, symbol: str, interval: int = 60) -> str:
+    """Return the entry's summary table for *symbol*, formatting it once."""
+    table = entry.tables.get(symbol)
+    if table is None:
+        table = entry.tables[symbol] = _format_ohlc(symbol, entry.series, interval)
+    return table
+
+
+def _cached_indicators(entry: _CachedOhlc, interval: int = 60) -> str:
+    """Return the entry's indicator summary, computing it once."""
+    if entry.indicators is None:
+        entry.indicators = compute_all(entry.series, interval)
+    return entry.indicators
+
+
+def _cached_levels(entry: _CachedOhlc) -> dict[str, list[float]]:
+    """Return the entry's support/resistance levels, computing them once."""
+    if entry.levels is None:
+        entry.levels = find_key_levels(entry.series)
+    return entry.levels
+
+
 async def fetch_ohlc(symbol: str, interval: int = 60) -> str:
     """Fetch and format OHLC candlestick data from Kraken.
 
     Standalone function that can be called both programmatically (for
-    pre-fetching) and from the LLM tool.
+    pre-fetching) and from the LLM tool. Only the table's 24-candle window
+    is requested unless a full fetch is already cached.
     """
-    raw = await _fetch_raw_ohlc(symbol, interval)
-    if isinstance(raw, str):
-        return raw
-    return _format_ohlc(symbol, raw, interval)
+    entry = await _fetch_ohlc(symbol, interval, window=24)
+    if isinstance(entry, str):
+        return entry
+    return _cached_table(entry, symbol, interval)
 
 
 # ---------------------------------------------------------------------------
 # Agent definition
 # ---------------------------------------------------------------------------
 
+_SYSTEM_PROMPT = (
+    "You are the Ideation Agent for the Leeson crypto trading system. "
+    "You are an experienced quantitative technical analyst focused on "
+    "multi-hour and daily chart patterns.\n\n"
+    "Your expertise:\n"
+    "- Trend identification via EMA crossovers and price momentum\n"
+    "- RSI divergence and overbought/oversold conditions\n"
+    "- MACD signal line crossovers and histogram momentum\n"
+    "- Bollinger Band squeeze and breakout detection\n"
+    "- ATR-based volatility assessment for position sizing\n"
+    "- Support and resistance level detection from swing highs/lows\n"
+    "- Candlestick pattern recognition (engulfing, doji, hammer, etc.)\n"
+    "- Volume analysis and divergence detection\n"
+    "- Multi-timeframe confluence\n\n"
+    "Your role:\n"
+    "- Analyze the OHLC data and computed technical indicators provided "
+    "in each prompt\n"
+    "- Use the calculate_indicators tool for additional timeframes\n"
+    "- Use the find_support_resistance tool for longer-timeframe levels "
+    "(e.g. 240min, 1440min)\n"
+    "- Use the get_ohlc tool for raw candle data when deeper visual "
+    "analysis is needed\n"
+    "- Require at least 2-3 confirming indicators before proposing a "
+    "trade (e.g. RSI + MACD alignment, or EMA crossover + Bollinger "
+    "breakout)\n"
+    "- Send trade ideas to Risk Agent using the send_trade_idea tool\n"
+    "- Focus on swing/position trades (hours to days), not scalping\n\n"
+    "You complement the Market Agent who focuses on real-time price "
+    "action and microstructure. You focus on the bigger picture — trend "
+    "direction, key levels, and indicator-confirmed entries.\n\n"
+    "Between full OHLC analyses, you receive market pulse checks with "
+    "current ticker prices and open positions. During pulse checks:\n"
+    "- Rely on key levels and trends from your most recent full analysis\n"
+    "- Spot price moves approaching key support/resistance levels\n"
+    "- Identify positions that may be at risk\n"
+    "- Flag urgent entry opportunities if price reaches a level you "
+    "previously identified\n"
+    "- If nothing notable, say so briefly — do not force a trade idea\n\n"
+    "Be concise. Only propose trades with clear technical justification, "
+    "multiple confirming indicators, and calibrated probability scores."
+)
+
 ideation_agent = Agent(
     model=None,
     defer_model_check=True,
     deps_type=AgentDeps,
-    system_prompt=(
-        "You are the Ideation Agent for the Leeson crypto trading system. "
-        "You are an experienced quantitative technical analyst focused on "
-        "multi-hour and daily chart patterns.\n\n"
-        "Your expertise:\n"
-        "- Trend identification via EMA crossovers and price momentum\n"
-        "- RSI divergence and overbought/oversold conditions\n"
-        "- MACD signal line crossovers and histogram momentum\n"
-        "- Bollinger Band squeeze and breakout detection\n"
-        "- ATR-based volatility assessment for position sizing\n"
-        "- Support and resistance level detection from swing highs/lows\n"
-        "- Candlestick pattern recognition (engulfing, doji, hammer, etc.)\n"
-        "- Volume analysis and divergence detection\n"
-        "- Multi-timeframe confluence\n\n"
-        "Your role:\n"
-        "- Analyze the OHLC data and computed technical indicators provided "
-        "in each prompt\n"
-        "- Use the calculate_indicators tool for additional timeframes\n"
-        "- Use the find_support_resistance tool for longer-timeframe levels "
-        "(e.g. 240min, 1440min)\n"
-        "- Use the get_ohlc tool for raw candle data when deeper visual "
-        "analysis is needed\n"
-        "- Require at least 2-3 confirming indicators before proposing a "
-        "trade (e.g. RSI + MACD alignment, or EMA crossover + Bollinger "
-        "breakout)\n"
-        "- Send trade ideas to Risk Agent using the send_trade_idea tool\n"
-        "- Focus on swing/position trades (hours to days), not scalping\n\n"
-        "You complement the Market Agent who focuses on real-time price "
-        "action and microstructure. You focus on the bigger picture — trend "
-        "direction, key levels, and indicator-confirmed entries.\n\n"
-        "Between full OHLC analyses, you receive market pulse checks with "
-        "current ticker prices and open positions. During pulse checks:\n"
-        "- Rely on key levels and trends from your most recent full analysis\n"
-        "- Spot price moves approaching key support/resistance levels\n"
-        "- Identify positions that may be at risk\n"
-        "- Flag urgent entry opportunities if price reaches a level you "
-        "previously identified\n"
-        "- If nothing notable, say so briefly — do not force a trade idea\n\n"
-        "Be concise. Only propose trades with clear technical justification, "
-        "multiple confirming indicators, and calibrated probability scores."
-    ),
+    system_prompt=_SYSTEM_PROMPT,
 )
 
 
+def _ticker_lines(state: SharedState) -> list[str]:
+    """One summary line per active pair that has a ticker snapshot."""
+    tickers = state.tickers
+    return [
+        _TICKER_FMT % (symbol, t.last, t.bid, t.ask, t.volume)
+        for symbol in state.active_pairs
+        if (t := tickers.get(symbol))
+    ]
+
+
+def _position_lines(state: SharedState) -> list[str]:
+    """One summary line per open position."""
+    return [
+        _POS_FMT
+        % (p.symbol, p.side, p.qty, p.entry_price, p.current_price, p.unrealized_pnl)
+        for p in state.positions.values()
+    ]
+
+
 @ideation_agent.instructions
 async def dynamic_context(ctx: RunContext[AgentDeps]) -> str:
     """Inject live ticker data and open positions for context."""
-    state = ctx.deps.state
+    return ctx.deps.state.render_cached("ideation", _render_context)
+
+
+def _render_context(state: SharedState) -> str:
+    """Build the ticker and position context block."""
     parts: list[str] = []
 
     # Live ticker snapshots for active pairs
-    ticker_lines: list[str] = []
-    for symbol in state.active_pairs:
-        ticker = state.tickers.get(symbol)
-        if ticker:
-            ticker_lines.append(
-                f"  {symbol}: last={ticker.last} bid={ticker.bid} "
-                f"ask={ticker.ask} vol={ticker.volume}"
-            )
+    ticker_lines = _ticker_lines(state)
     if ticker_lines:
         parts.append("Current ticker data:")
         parts.extend(ticker_lines)
@@ -199,12 +389,7 @@ async def dynamic_context(ctx: RunContext[AgentDeps]) -> str:
     # Open positions
     if state.positions:
         parts.append("Open positions:")
-        for p in state.positions.values():
-            parts.append(
-                f"  {p.symbol} {p.side} qty={p.qty} "
-                f"entry={p.entry_price} current={p.current_price} "
-                f"pnl={p.unrealized_pnl}"
-            )
+        parts.extend(_position_lines(state))
         parts.append(
             "\nIMPORTANT: Do NOT propose trades that duplicate existing "
             "positions (same symbol and same side). If you see a strong "
@@ -255,11 +440,10 @@ async def calculate_indicators(
         symbol: Trading pair (e.g. "BTC/USD").
         interval: Candle interval in minutes. Valid: 1, 5, 15, 30, 60, 240, 1440, 10080, 21600.
     """
-    raw = await _fetch_raw_ohlc(symbol, interval)
-    if isinstance(raw, str):
-        return raw
-    candles = parse_candles(raw)
-    return compute_all(candles, interval)
+    entry = await _fetch_ohlc(symbol, interval)
+    if isinstance(entry, str):
+        return entry
+    return _cached_indicators(entry, interval)
 
 
 @ideation_agent.tool
@@ -277,19 +461,19 @@ async def find_support_resistance_tool(
         symbol: Trading pair (e.g. "BTC/USD").
         interval: Candle interval in minutes. Valid: 1, 5, 15, 30, 60, 240, 1440, 10080, 21600.
     """
-    raw = await _fetch_raw_ohlc(symbol, interval)
-    if isinstance(raw, str):
-        return raw
+    entry = await _fetch_ohlc(symbol, interval)
+    if isinstance(entry, str):
+        return entry
 
-    candles = parse_candles(raw)
-    current = candles[-1].close
-    levels = find_key_levels(candles)
+    series = entry.series
+    current = series.close[-1]
+    levels = _cached_levels(entry)
 
     r_str = " | ".join(f"{lv:,.1f}" for lv in sorted(levels["resistance"])) or "none detected"
     s_str = " | ".join(f"{lv:,.1f}" for lv in sorted(levels["support"])) or "none detected"
 
     return (
-        f"Key levels for {symbol} ({interval}min, {len(candles)} candles)\n"
+        f"Key levels for {symbol} ({interval}min, {len(series.close)} candles)\n"
         f"Current price: {current:,.1f}\n"
         f"Resistance: {r_str}\n"
         f"Support: {s_str}"
@@ -348,69 +532,71 @@ async def send_trade_idea(
 # ---------------------------------------------------------------------------
 
 
-async def _fetch_pair_data(pair: str) -> tuple[str, list[list] | str]:
-    """Fetch raw OHLC for a single pair, returning (pair, raw_or_error)."""
-    raw = await _fetch_raw_ohlc(pair)
-    return pair, raw
+_PERIODIC_PROMPT = (
+    "Analyze the following active pairs for swing trade opportunities.\n\n"
+    "Hourly OHLC data and computed technical indicators for each pair:\n\n"
+    "{}\n\n"
+    "For each pair, assess:\n"
+    "1. Trend direction (EMA alignment, momentum)\n"
+    "2. Momentum conditions (RSI, MACD histogram direction)\n"
+    "3. Volatility context (Bollinger position, ATR)\n"
+    "4. Key support/resistance levels\n"
+    "5. Volume confirmation\n\n"
+    "Only propose a trade if 2-3 indicators confirm the setup. Use "
+    "send_trade_idea to propose trades. You can use calculate_indicators "
+    "or find_support_resistance for additional timeframes if you need "
+    "multi-timeframe confluence."
+).format
+
+
+def _analyze_pair(pair: str, entry: _CachedOhlc) -> str:
+    """Render one pair's prompt section: the 24-candle table and indicators."""
+    table = _cached_table(entry, pair)
+    indicators = _cached_indicators(entry)
+    return f"--- {pair} ---\n{table}\n\n{indicators}"
+
+
+async def _pair_section(pair: str) -> str:
+    """Fetch OHLC for a single pair and render its prompt section."""
+    entry = await _fetch_ohlc(pair)
+    if isinstance(entry, str):
+        return f"--- {pair} ---\n{entry}"
+    # Indicator math is CPU-bound; run it off the event loop so the stdin
+    # bridge and the other agents keep being serviced meanwhile.
+    return await asyncio.to_thread(_analyze_pair, pair, entry)
 
 
 async def run_periodic(
-    deps: AgentDeps, history: list, *, model: object
-) -> list:
+    deps: AgentDeps, history: deque
+) -> None:
     """Fetch OHLC data for all active pairs and analyze for opportunities."""
     pairs = deps.state.active_pairs
     if not pairs:
-        return history
+        return
 
-    # Pre-fetch hourly OHLC data for all active pairs concurrently.
+    # Fetch and analyze hourly OHLC data for all active pairs concurrently.
     results = await asyncio.gather(
-        *(_fetch_pair_data(pair) for pair in pairs),
+        *(_pair_section(pair) for pair in pairs),
         return_exceptions=True,
     )
 
-    ohlc_sections: list[str] = []
-    for result in results:
-        if isinstance(result, Exception):
-            ohlc_sections.append(f"Fetch error: {result}")
-            continue
-
-        pair, raw = result
-        if isinstance(raw, str):
-            ohlc_sections.append(f"--- {pair} ---\n{raw}")
-            continue
-
-        # Format both the 24-candle table and computed indicators
-        table = _format_ohlc(pair, raw)
-        candles = parse_candles(raw)
-        indicators = compute_all(candles)
-        ohlc_sections.append(f"--- {pair} ---\n{table}\n\n{indicators}")
+    ohlc_sections = [
+        f"Fetch error: {result}" if isinstance(result, Exception) else result
+        for result in results
+    ]
 
     ohlc_block = "\n\n".join(ohlc_sections)
 
-    prompt = (
-        f"Analyze the following active pairs for swing trade opportunities.\n\n"
-        f"Hourly OHLC data and computed technical indicators for each pair:\n\n"
-        f"{ohlc_block}\n\n"
-        f"For each pair, assess:\n"
-        f"1. Trend direction (EMA alignment, momentum)\n"
-        f"2. Momentum conditions (RSI, MACD histogram direction)\n"
-        f"3. Volatility context (Bollinger position, ATR)\n"
-        f"4. Key support/resistance levels\n"
-        f"5. Volume confirmation\n\n"
-        f"Only propose a trade if 2-3 indicators confirm the setup. Use "
-        f"send_trade_idea to propose trades. You can use calculate_indicators "
-        f"or find_support_resistance for additional timeframes if you need "
-        f"multi-timeframe confluence."
-    )
+    prompt = _PERIODIC_PROMPT(ohlc_block)
 
-    return await run_agent_streamed(
-        ideation_agent, prompt, deps=deps, history=history, model=model, panel=PANEL
+    await run_agent_streamed(
+        ideation_agent, prompt, deps=deps, history=history, panel=PANEL
     )
 
 
 async def run_market_pulse(
-    deps: AgentDeps, history: list, *, model: object
-) -> list:
+    deps: AgentDeps, history: deque
+) -> None:
     """Lightweight market pulse check using only SharedState data.
 
     No REST API calls — uses cached ticker snapshots and open positions
@@ -419,30 +605,15 @@ async def run_market_pulse(
     state = deps.state
     pairs = state.active_pairs
     if not pairs:
-        return history
+        return
 
     # Build compact ticker summary
-    ticker_lines: list[str] = []
-    for symbol in pairs:
-        ticker = state.tickers.get(symbol)
-        if ticker:
-            ticker_lines.append(
-                f"  {symbol}: last={ticker.last} bid={ticker.bid} "
-                f"ask={ticker.ask} vol={ticker.volume}"
-            )
-
+    ticker_lines = _ticker_lines(state)
     if not ticker_lines:
-        return history  # no ticker data yet
+        return  # no ticker data yet
 
     # Build position summary
-    position_lines: list[str] = []
-    for p in state.positions.values():
-        position_lines.append(
-            f"  {p.symbol} {p.side} qty={p.qty} "
-            f"entry={p.entry_price} current={p.current_price} "
-            f"pnl={p.unrealized_pnl}"
-        )
-
+    position_lines = _position_lines(state)
     pos_block = "\n".join(position_lines) if position_lines else "  None"
 
     prompt = (
@@ -457,6 +628,6 @@ async def run_market_pulse(
         "Use send_trade_idea only if you see a clear, urgent opportunity."
     )
 
-    return await run_agent_streamed(
-        ideation_agent, prompt, deps=deps, history=history, model=model, panel=PANEL
+    await run_agent_streamed(
+        ideation_agent, prompt, deps=deps, history=history, panel=PANEL
     )
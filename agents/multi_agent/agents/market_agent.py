@@ -7,6 +7,9 @@ creative trader with deep technical and microstructure knowledge.
 
 from __future__ import annotations
 
+from collections import deque
+from typing import TYPE_CHECKING
+
 from pydantic_ai import Agent, RunContext
 
 from multi_agent.bridge import output_to_panel
@@ -21,8 +24,15 @@ from multi_agent.models import (
     validate_trade_idea,
 )
 
+if TYPE_CHECKING:
+    from multi_agent.state import SharedState
+
 PANEL = 1
 
+# Ticker and position line layouts; every field is already a string.
+_TICKER_FMT = "%s: bid=%s ask=%s last=%s vol=%s"
+_POS_FMT = "  %s %s qty=%s entry=%s current=%s pnl=%s"
+
 market_agent = Agent(
     model=None,
     defer_model_check=True,
@@ -47,22 +57,24 @@ market_agent = Agent(
 @market_agent.instructions
 async def dynamic_context(ctx: RunContext[AgentDeps]) -> str:
     """Inject current ticker data for active pairs."""
-    state = ctx.deps.state
+    return ctx.deps.state.render_cached("market", _render_context)
+
+
+def _render_context(state: SharedState) -> str:
+    """Build the ticker and open-position summary."""
     parts = []
     for symbol in state.active_pairs:
         ticker = state.tickers.get(symbol)
         if ticker:
             parts.append(
-                f"{symbol}: bid={ticker.bid} ask={ticker.ask} "
-                f"last={ticker.last} vol={ticker.volume}"
+                _TICKER_FMT % (symbol, ticker.bid, ticker.ask, ticker.last, ticker.volume)
             )
     if state.positions:
         parts.append("Open positions:")
         for p in state.positions.values():
             parts.append(
-                f"  {p.symbol} {p.side} qty={p.qty} "
-                f"entry={p.entry_price} current={p.current_price} "
-                f"pnl={p.unrealized_pnl}"
+                _POS_FMT
+                % (p.symbol, p.side, p.qty, p.entry_price, p.current_price, p.unrealized_pnl)
             )
     return "\n".join(parts) if parts else "No market data yet."
 
@@ -145,55 +157,50 @@ async def get_ticker(ctx: RunContext[AgentDeps], symbol: str) -> str:
     ticker = ctx.deps.state.tickers.get(symbol)
     if not ticker:
         return f"No ticker data for {symbol}"
-    return (
-        f"{symbol}: bid={ticker.bid} ask={ticker.ask} "
-        f"last={ticker.last} vol={ticker.volume}"
-    )
+    return _TICKER_FMT % (symbol, ticker.bid, ticker.ask, ticker.last, ticker.volume)
 
 
 async def run_on_user_request(
-    deps: AgentDeps, request: UserRequest, history: list, *, model: object
-) -> list:
+    deps: AgentDeps, request: UserRequest, history: deque
+) -> None:
     """Run Market Agent on a user-forwarded request."""
     output_to_panel(PANEL, f"[user] {request.content}")
-    return await run_agent_streamed(
+    await run_agent_streamed(
         market_agent,
         f"Analyze this request: {request.content}",
         deps=deps,
         history=history,
-        model=model,
         panel=PANEL,
     )
 
 
 async def run_on_ticker(
-    deps: AgentDeps, symbol: str, history: list, *, model: object
-) -> list:
+    deps: AgentDeps, symbol: str, history: deque
+) -> None:
     """Run Market Agent on a meaningful ticker update."""
     ticker = deps.state.tickers.get(symbol)
     if not ticker:
-        return history
+        return
     prompt = (
         f"Price update for {symbol}: "
         f"bid={ticker.bid} ask={ticker.ask} last={ticker.last} vol={ticker.volume}. "
         f"Assess if there's a trading opportunity."
     )
-    return await run_agent_streamed(
-        market_agent, prompt, deps=deps, history=history, model=model, panel=PANEL
+    await run_agent_streamed(
+        market_agent, prompt, deps=deps, history=history, panel=PANEL
     )
 
 
 async def run_on_consultation(
-    deps: AgentDeps, consult: ConsultMarket, history: list, *, model: object
-) -> list:
+    deps: AgentDeps, consult: ConsultMarket, history: deque
+) -> None:
     """Run Market Agent on a Risk Agent consultation."""
     output_to_panel(PANEL, f"[risk asks] {consult.symbol}: {consult.question}")
-    return await run_agent_streamed(
+    await run_agent_streamed(
         market_agent,
         f"Risk Agent asks about {consult.symbol}: {consult.question}. "
         f"Use respond_to_consultation tool to reply.",
         deps=deps,
         history=history,
-        model=model,
         panel=PANEL,
     )
@@ -7,6 +7,9 @@ Cuts losses at 2% of position value.
 
 from __future__ import annotations
 
+from collections import deque
+from typing import TYPE_CHECKING
+
 from pydantic_ai import Agent, RunContext
 
 from multi_agent.bridge import output_to_panel
@@ -21,8 +24,15 @@ from multi_agent.models import (
     run_agent_streamed,
 )
 
+if TYPE_CHECKING:
+    from multi_agent.state import SharedState
+
 PANEL = 2
 
+# Context line layouts for positions and balances.
+_POS_FMT = "  %s %s qty=%s entry=%s current=%s pnl=%s"
+_BALANCE_FMT = "Balance: %s = %s"
+
 risk_agent = Agent(
     model=None,
     defer_model_check=True,
@@ -46,7 +56,11 @@ risk_agent = Agent(
 @risk_agent.instructions
 async def dynamic_context(ctx: RunContext[AgentDeps]) -> str:
     """Inject risk limits, positions, and token state."""
-    state = ctx.deps.state
+    return ctx.deps.state.render_cached("risk", _render_context)
+
+
+def _render_context(state: SharedState) -> str:
+    """Build the limits, positions and balances summary."""
     parts = []
     if state.risk_limits:
         parts.append(f"Risk limits: {state.risk_limits}")
@@ -55,15 +69,14 @@ async def dynamic_context(ctx: RunContext[AgentDeps]) -> str:
         parts.append("Open positions:")
         for p in state.positions.values():
             parts.append(
-                f"  {p.symbol} {p.side} qty={p.qty} "
-                f"entry={p.entry_price} current={p.current_price} "
-                f"pnl={p.unrealized_pnl}"
+                _POS_FMT
+                % (p.symbol, p.side, p.qty, p.entry_price, p.current_price, p.unrealized_pnl)
             )
     else:
         parts.append("No open positions.")
     if state.balances:
         for b in state.balances.values():
-            parts.append(f"Balance: {b.asset} = {b.balance}")
+            parts.append(_BALANCE_FMT % (b.asset, b.balance))
     return "\n".join(parts)
 
 
@@ -184,8 +197,8 @@ async def get_position_summary(ctx: RunContext[AgentDeps]) -> str:
 
 
 async def run_on_trade_idea(
-    deps: AgentDeps, idea: TradeIdea, history: list, *, model: object
-) -> list:
+    deps: AgentDeps, idea: TradeIdea, history: deque
+) -> None:
     """Evaluate a trade idea from the Market Agent."""
     output_to_panel(
         PANEL,
@@ -200,14 +213,14 @@ async def run_on_trade_idea(
         f"Reason: {idea.reason}\n\n"
         f"Approve or reject based on risk limits and position sizing rules."
     )
-    return await run_agent_streamed(
-        risk_agent, prompt, deps=deps, history=history, model=model, panel=PANEL
+    await run_agent_streamed(
+        risk_agent, prompt, deps=deps, history=history, panel=PANEL
     )
 
 
 async def run_on_market_analysis(
-    deps: AgentDeps, analysis: MarketAnalysis, history: list, *, model: object
-) -> list:
+    deps: AgentDeps, analysis: MarketAnalysis, history: deque
+) -> None:
     """Process a consultation response from Market Agent."""
     prompt = (
         f"Market Agent responds about {analysis.symbol}:\n"
@@ -215,32 +228,32 @@ async def run_on_market_analysis(
         f"Recommendation: {analysis.recommendation}\n\n"
         f"Decide what action to take on this position."
     )
-    return await run_agent_streamed(
-        risk_agent, prompt, deps=deps, history=history, model=model, panel=PANEL
+    await run_agent_streamed(
+        risk_agent, prompt, deps=deps, history=history, panel=PANEL
     )
 
 
 async def run_on_execution_update(
-    deps: AgentDeps, data: list[dict], history: list, *, model: object
-) -> list:
+    deps: AgentDeps, data: list[dict], history: deque
+) -> None:
     """Process execution updates (order fills, status changes)."""
     prompt = f"Execution update received: {data}. Review position state."
-    return await run_agent_streamed(
-        risk_agent, prompt, deps=deps, history=history, model=model, panel=PANEL
+    await run_agent_streamed(
+        risk_agent, prompt, deps=deps, history=history, panel=PANEL
     )
 
 
 async def run_position_review(
-    deps: AgentDeps, history: list, *, model: object
-) -> list:
+    deps: AgentDeps, history: deque
+) -> None:
     """Periodic review of all open positions (every 30 seconds)."""
     if not deps.state.positions:
-        return history
+        return
     output_to_panel(PANEL, "[risk] Periodic position review...")
     prompt = (
         "Review all open positions. Check if any need to be closed "
         "(2% loss rule) or if the Market Agent should be consulted."
     )
-    return await run_agent_streamed(
-        risk_agent, prompt, deps=deps, history=history, model=model, panel=PANEL
+    await run_agent_streamed(
+        risk_agent, prompt, deps=deps, history=history, panel=PANEL
     )
@@ -7,13 +7,24 @@ trading decisions directly.
 
 from __future__ import annotations
 
+from collections import deque
+from typing import TYPE_CHECKING
+
 from pydantic_ai import Agent, RunContext
 
 from multi_agent.bridge import output_to_panel
 from multi_agent.models import AgentDeps, AgentRole, UserRequest, run_agent_streamed
 
+if TYPE_CHECKING:
+    from multi_agent.state import SharedState
+
 PANEL = 0
 
+# Status line layouts.
+_POS_SHORT_FMT = "%s %s %s"
+_POS_FMT = "Position: %s %s qty=%s entry=%s pnl=%s"
+_BALANCE_FMT = "Balance: %s = %s"
+
 user_agent = Agent(
     model=None,
     defer_model_check=True,
@@ -35,7 +46,11 @@ user_agent = Agent(
 @user_agent.instructions
 async def dynamic_context(ctx: RunContext[AgentDeps]) -> str:
     """Inject current system state into the prompt."""
-    state = ctx.deps.state
+    return ctx.deps.state.render_cached("user", _render_context)
+
+
+def _render_context(state: SharedState) -> str:
+    """Build the system state summary."""
     parts = []
     if state.risk_limits:
         parts.append(f"Risk limits: {state.risk_limits}")
@@ -44,7 +59,8 @@ async def dynamic_context(ctx: RunContext[AgentDeps]) -> str:
     parts.append(f"Token state: {state.token_state}")
     if state.positions:
         pos_summary = ", ".join(
-            f"{p.symbol} {p.side} {p.qty}" for p in state.positions.values()
+            _POS_SHORT_FMT % (p.symbol, p.side, p.qty)
+            for p in state.positions.values()
         )
         parts.append(f"Open positions: {pos_summary}")
     return "\n".join(parts) if parts else "No active state yet."
@@ -73,6 +89,7 @@ async def update_trading_pairs(
         pairs: List of trading pair symbols (e.g. ["BTC/USD", "ETH/USD"]).
     """
     ctx.deps.state.active_pairs = pairs
+    ctx.deps.state.version += 1
     return f"Active pairs updated: {', '.join(pairs)}"
 
 
@@ -86,24 +103,23 @@ async def get_system_status(ctx: RunContext[AgentDeps]) -> str:
     if state.positions:
         for p in state.positions.values():
             lines.append(
-                f"Position: {p.symbol} {p.side} qty={p.qty} "
-                f"entry={p.entry_price} pnl={p.unrealized_pnl}"
+                _POS_FMT % (p.symbol, p.side, p.qty, p.entry_price, p.unrealized_pnl)
             )
     else:
         lines.append("No open positions.")
     if state.balances:
         for b in state.balances.values():
-            lines.append(f"Balance: {b.asset} = {b.balance}")
+            lines.append(_BALANCE_FMT % (b.asset, b.balance))
     if state.risk_limits:
         lines.append(f"Risk limits: {state.risk_limits}")
     return "\n".join(lines)
 
 
 async def run_once(
-    deps: AgentDeps, user_input: str, history: list, *, model: object
-) -> list:
+    deps: AgentDeps, user_input: str, history: deque
+) -> None:
     """Run the user agent on a single user message, returning updated history."""
     output_to_panel(PANEL, f"> {user_input}")
-    return await run_agent_streamed(
-        user_agent, user_input, deps=deps, history=history, model=model, panel=PANEL
+    await run_agent_streamed(
+        user_agent, user_input, deps=deps, history=history, panel=PANEL
     )
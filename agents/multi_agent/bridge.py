@@ -1,63 +1,277 @@
 """Sync stdin/stdout bridge for async agent system.
 
-A background thread reads JSON-lines from stdin (blocking) and pushes
-parsed dicts into an asyncio queue. Writing to stdout is synchronous
-via the GIL but wrapped for convenience.
+JSON-lines from stdin are read by the event loop (or, on a terminal, a
+background thread) and pushed as parsed dicts into an inbox the router
+drains. Lines written to stdout from the event loop are coalesced and
+flushed together shortly after; writes from outside the loop go out
+immediately.
 """
 
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
+import os
+import stat
 import sys
 import threading
+from collections import deque
+from collections.abc import Callable
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dumps_line(obj: dict[str, Any]) -> bytes:
+    """Serialize *obj* as one newline-terminated JSON line."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj) + "\n").encode()
+
+
+def _dumps_str(value: str) -> bytes:
+    """Serialize a single string as a JSON string literal."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode()
+
+
+# Pre-serialized framing for output lines, one per TUI panel (0-2).
+_OUTPUT_PREFIX = tuple(
+    b'{"type":"output","agent":%d,"line":' % panel for panel in range(3)
+)
+_STREAM_PREFIX = tuple(
+    b'{"type":"stream_delta","agent":%d,"delta":' % panel for panel in range(3)
+)
+
 
 class StdinBridge:
-    """Reads JSON-lines from stdin in a background thread, feeds an async queue."""
+    """Reads JSON-lines from stdin and feeds them to an async inbox.
+
+    When stdin is a pipe or socket it is read by the event loop itself;
+    otherwise (a terminal, a file, or a platform without pipe support) a
+    background thread does blocking reads.
+    """
 
     def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
         self._loop = loop
-        self._queue: asyncio.Queue[dict | None] = asyncio.Queue()
+        self._queue = _Inbox()
         self._thread = threading.Thread(target=self._reader, daemon=True)
 
-    def start(self) -> None:
+    async def start(self) -> None:
+        # Only pipes and sockets can be polled; a terminal would also share
+        # its file description (and non-blocking mode) with stdout.
+        mode = os.fstat(sys.stdin.fileno()).st_mode
+        if stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode):
+            try:
+                await self._loop.connect_read_pipe(
+                    lambda: _StdinProtocol(self._queue.put_nowait), sys.stdin
+                )
+                return
+            except (OSError, ValueError, NotImplementedError):
+                pass
         self._thread.start()
 
     async def recv(self) -> dict | None:
         """Wait for the next parsed JSON dict, or None on EOF/shutdown."""
         return await self._queue.get()
 
+    async def recv_batch(self, limit: int = 128) -> list[dict | None]:
+        """Wait for the next message, then take any others already queued.
+
+        Returns at most *limit* messages in arrival order. A ``None``
+        (EOF) is always the last element.
+        """
+        inbox = self._queue
+        msg = await inbox.get()
+        batch = [msg]
+        items = inbox.items
+        while msg is not None and len(batch) < limit and items:
+            msg = inbox.get_nowait()
+            batch.append(msg)
+        return batch
+
     def _reader(self) -> None:
         """Blocking stdin reader running in a background thread."""
+        deliver = functools.partial(
+            self._loop.call_soon_threadsafe, self._queue.put_nowait
+        )
+        # Same line splitting as the pipe path, fed from blocking reads;
+        # read1 returns whatever is available instead of waiting for a
+        # full chunk.
+        lines = _StdinProtocol(deliver)
+        read = sys.stdin.buffer.read1
         try:
-            for raw in sys.stdin:
-                raw = raw.strip()
-                if not raw:
-                    continue
-                try:
-                    msg = json.loads(raw)
-                except json.JSONDecodeError:
-                    continue
-                asyncio.run_coroutine_threadsafe(
-                    self._queue.put(msg), self._loop
-                )
+            while chunk := read(65536):
+                lines.data_received(chunk)
         except (KeyboardInterrupt, EOFError):
             pass
+        lines.connection_lost(None)
+
+
+class _Inbox:
+    """Single-consumer channel from the stdin reader to the router.
+
+    Every put runs on the event loop thread (the reader thread hops over
+    with ``call_soon_threadsafe``), so, like the agent bus, this is just
+    a deque plus an Event that wakes the consumer when it finds the
+    deque empty -- no getter futures or queue bookkeeping per message.
+
+    Once ``limit`` messages are waiting, each new arrival evicts the oldest
+    queued ``ticker_update`` (a newer one supersedes it anyway). Other
+    messages are never dropped, so the inbox only grows past the limit
+    when it holds no tickers at all.
+    """
+
+    def __init__(self, limit: int = 1024) -> None:
+        self.items: deque[dict | None] = deque()
+        self._ready = asyncio.Event()
+        self._limit = limit
+        # Tickers currently queued, so a full inbox holding none skips the
+        # eviction scan instead of walking every message on each put.
+        self._tickers = 0
+
+    def put_nowait(self, item: dict | None) -> None:
+        items = self.items
+        if len(items) >= self._limit and self._tickers:
+            for i, old in enumerate(items):
+                if _is_ticker(old):
+                    del items[i]
+                    self._tickers -= 1
+                    break
+        if _is_ticker(item):
+            self._tickers += 1
+        items.append(item)
+        self._ready.set()
+
+    def get_nowait(self) -> dict | None:
+        """Remove and return the oldest message; the inbox must be non-empty."""
+        item = self.items.popleft()
+        if _is_ticker(item):
+            self._tickers -= 1
+        return item
+
+    async def get(self) -> dict | None:
+        items = self.items
+        while not items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.get_nowait()
+
+
+def _is_ticker(item: dict | None) -> bool:
+    """Whether *item* is a ``ticker_update`` the inbox may evict."""
+    return item is not None and item.get("type") == "ticker_update"
+
+
+class _StdinProtocol(asyncio.Protocol):
+    """Splits stdin bytes into JSON lines and hands each to ``deliver``."""
+
+    def __init__(self, deliver: Callable[[dict | None], object]) -> None:
+        self._deliver = deliver
+        self._buf = bytearray()
+
+    def data_received(self, data: bytes) -> None:
+        buf = self._buf
+        buf += data
+        start = 0
+        while (end := buf.find(b"\n", start)) != -1:
+            msg = _decode_line(buf[start:end])
+            if msg is not None:
+                self._deliver(msg)
+            start = end + 1
+        del buf[:start]
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        # A final line without a trailing newline still counts.
+        msg = _decode_line(self._buf)
+        if msg is not None:
+            self._deliver(msg)
+        self._buf.clear()
         # Signal EOF
-        asyncio.run_coroutine_threadsafe(self._queue.put(None), self._loop)
+        self._deliver(None)
+
+
+def _decode_line(raw: bytes | bytearray) -> dict | None:
+    """Parse one JSON line, or return None for blank or malformed input."""
+    try:
+        # Both decoders skip surrounding whitespace; blank lines fail to parse.
+        return _loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+# Streaming deltas arrive per token; batching them turns one write+flush
+# per message into one per FLUSH_DELAY (or per FLUSH_BATCH lines).
+FLUSH_DELAY = 0.001
+FLUSH_BATCH = 256
+
+_pending: list[bytes] = []
+_flush_handle: asyncio.TimerHandle | None = None
+_write_lock = threading.Lock()
 
 
 def send_to_tui(obj: dict[str, Any]) -> None:
-    """Write a JSON-lines message to stdout for the Rust TUI."""
-    sys.stdout.write(json.dumps(obj) + "\n")
-    sys.stdout.flush()
+    """Queue a JSON-lines message for the Rust TUI.
+
+    On the event loop the line is buffered and flushed within
+    ``FLUSH_DELAY``; from any other context it is written immediately.
+    """
+    _send_line(_dumps_line(obj))
+
+
+def _send_line(line: bytes) -> None:
+    """Buffer (or write) one already-serialized JSON line."""
+    global _flush_handle
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        with _write_lock:
+            _pending.append(line)
+            _write_pending()
+        return
+
+    # Off-loop writers drain the buffer under the lock, so append under
+    # it too or a concurrent drain could clear this line unwritten.
+    with _write_lock:
+        _pending.append(line)
+        full = len(_pending) >= FLUSH_BATCH
+    if full:
+        flush_tui()
+    elif _flush_handle is None:
+        _flush_handle = loop.call_later(FLUSH_DELAY, flush_tui)
+
+
+def flush_tui() -> None:
+    """Write out any buffered TUI messages now. Called on shutdown."""
+    global _flush_handle
+    if _flush_handle is not None:
+        _flush_handle.cancel()
+        _flush_handle = None
+    with _write_lock:
+        _write_pending()
+
+
+def _write_pending() -> None:
+    """Write and flush all buffered lines. Caller holds ``_write_lock``."""
+    if not _pending:
+        return
+    batch = b"".join(_pending)
+    _pending.clear()
+    out = sys.stdout.buffer
+    out.write(batch)
+    out.flush()
 
 
 def output_to_panel(panel: int, line: str) -> None:
     """Convenience: write a line to a specific TUI panel."""
-    send_to_tui({"type": "output", "agent": panel, "line": line})
+    _send_line(_OUTPUT_PREFIX[panel] + _dumps_str(line) + b"}\n")
 
 
 def send_ready() -> None:
@@ -81,7 +295,7 @@ def send_token_usage(input_tokens: int, output_tokens: int) -> None:
 
 def send_stream_delta(panel: int, delta: str) -> None:
     """Send a streaming text delta to a TUI panel."""
-    send_to_tui({"type": "stream_delta", "agent": panel, "delta": delta})
+    _send_line(_STREAM_PREFIX[panel] + _dumps_str(delta) + b"}\n")
 
 
 def send_stream_end(panel: int) -> None:
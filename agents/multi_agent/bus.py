@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
+from collections.abc import Callable, Hashable
 
 import logfire
 
@@ -10,26 +12,70 @@ from multi_agent.models import AgentMessage, AgentRole
 
 
 class AgentBus:
-    """Routes messages between agents via per-role async queues."""
+    """Routes messages between agents via per-role async queues.
+
+    Each role has exactly one consumer, so a queue is a plain deque plus
+    an Event that wakes the consumer when it finds the deque empty.
+    """
 
     def __init__(self) -> None:
-        self._queues: dict[AgentRole, asyncio.Queue[AgentMessage]] = {
-            role: asyncio.Queue() for role in AgentRole
-        }
+        # Indexed by AgentRole.slot rather than keyed by role, so routing
+        # is a list subscript instead of an enum hash.
+        self._queues: list[deque[AgentMessage]] = [deque() for _ in AgentRole]
+        self._events: list[asyncio.Event] = [asyncio.Event() for _ in AgentRole]
 
     async def send(self, to: AgentRole, message: AgentMessage) -> None:
         """Send a message to a specific agent's queue."""
         logfire.info('bus_send:{to}', to=to.value, message_type=type(message).__name__)
-        await self._queues[to].put(message)
+        slot = to.slot
+        self._queues[slot].append(message)
+        self._events[slot].set()
+
+    async def send_latest(
+        self,
+        to: AgentRole,
+        message: AgentMessage,
+        key: Callable[[AgentMessage], Hashable],
+    ) -> None:
+        """Send a message that supersedes any queued one with the same key.
+
+        If a message of the same type and ``key`` is still waiting in the
+        queue it is replaced in place, keeping its position; otherwise
+        this behaves like :meth:`send`. Only for snapshot-style messages
+        where the newest value is all the consumer needs.
+        """
+        logfire.info('bus_send_latest:{to}', to=to.value, message_type=type(message).__name__)
+        slot = to.slot
+        queue = self._queues[slot]
+        kind = type(message)
+        wanted = key(message)
+        for i, queued in enumerate(queue):
+            if type(queued) is kind and key(queued) == wanted:
+                queue[i] = message
+                return
+        queue.append(message)
+        self._events[slot].set()
 
     async def recv(self, role: AgentRole) -> AgentMessage:
         """Wait for the next message in an agent's queue."""
-        return await self._queues[role].get()
+        slot = role.slot
+        queue = self._queues[slot]
+        while not queue:
+            event = self._events[slot]
+            event.clear()
+            await event.wait()
+        return queue.popleft()
 
-    async def broadcast(
+    def broadcast(
         self, message: AgentMessage, *, exclude: AgentRole | None = None
     ) -> None:
-        """Send a message to all agents except the excluded one."""
-        for role, queue in self._queues.items():
-            if role != exclude:
-                await queue.put(message)
+        """Send a message to all agents except the excluded one.
+
+        Synchronous: appending never blocks, so the whole fan-out runs in
+        one scheduler slice.
+        """
+        skip = exclude.slot if exclude is not None else -1
+        for slot, queue in enumerate(self._queues):
+            if slot != skip:
+                queue.append(message)
+                self._events[slot].set()
@@ -1,15 +1,27 @@
-"""Pydantic models for inter-agent messages and shared dependencies."""
+"""Inter-agent message types and shared dependencies.
+
+Messages are slotted dataclasses: they are built on every bus hop and
+only carry values between agents in-process, so they skip validation.
+"""
 
 from __future__ import annotations
 
+import asyncio
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Self
 
 import logfire
-from pydantic import BaseModel
 from pydantic_ai import Agent
 from pydantic_ai._agent_graph import ModelRequestNode
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    RetryPromptPart,
+    ToolCallPart,
+    ToolReturnPart,
+)
 
 from multi_agent.bridge import send_stream_delta, send_stream_end, send_token_usage
 
@@ -18,26 +30,46 @@ if TYPE_CHECKING:
     from multi_agent.state import SharedState
 
 
+HISTORY_MAX_MESSAGES = 30
+# Rough cap on the replayed history, estimated at ~4 characters per token.
+HISTORY_MAX_TOKENS = 12_000
+TOKEN_REPORT_INTERVAL = 0.1  # seconds
+
+
 class AgentRole(str, Enum):
-    """Identifies each agent for message routing."""
+    """Identifies each agent for message routing.
+
+    ``slot`` is a dense 0-based id the bus uses to address its per-role
+    queues by list position.
+    """
+
+    slot: int
 
-    USER = "user"
-    MARKET = "market"
-    IDEATION = "ideation"
-    RISK = "risk"
-    EXECUTION = "execution"
+    def __new__(cls, value: str, slot: int) -> Self:
+        member = str.__new__(cls, value)
+        member._value_ = value
+        member.slot = slot
+        return member
+
+    USER = "user", 0
+    MARKET = "market", 1
+    IDEATION = "ideation", 2
+    RISK = "risk", 3
+    EXECUTION = "execution", 4
 
 
 # -- Inter-agent messages --
 
 
-class UserRequest(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class UserRequest:
     """Operator's analysis request forwarded from User Agent to Market Agent."""
 
     content: str
 
 
-class TradeIdea(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class TradeIdea:
     """Proposed trade from Market Agent to Risk Agent."""
 
     symbol: str
@@ -49,14 +81,16 @@ class TradeIdea(BaseModel):
     order_type: str = "limit"
 
 
-class ConsultMarket(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ConsultMarket:
     """Risk Agent asking Market Agent about an existing position."""
 
     symbol: str
     question: str
 
 
-class MarketAnalysis(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class MarketAnalysis:
     """Market Agent's response to a Risk consultation."""
 
     symbol: str
@@ -64,7 +98,8 @@ class MarketAnalysis(BaseModel):
     recommendation: str  # "hold", "close", "add"
 
 
-class ApprovedOrder(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ApprovedOrder:
     """Sized order approved by Risk Agent for Execution Agent."""
 
     symbol: str
@@ -76,7 +111,8 @@ class ApprovedOrder(BaseModel):
     reason: str
 
 
-class ClosePosition(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ClosePosition:
     """Risk Agent instructs Execution Agent to close a position."""
 
     symbol: str
@@ -85,7 +121,8 @@ class ClosePosition(BaseModel):
     reason: str
 
 
-class OrderPlaced(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class OrderPlaced:
     """Execution Agent notifies Risk and Market of order result."""
 
     symbol: str
@@ -96,13 +133,15 @@ class OrderPlaced(BaseModel):
     error: str | None = None
 
 
-class OrderFilled(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class OrderFilled:
     """Execution update from exchange, forwarded to Risk Agent."""
 
     data: list[dict]
 
 
-class TickerBroadcast(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class TickerBroadcast:
     """Price update for an active pair, forwarded to Market Agent."""
 
     data: dict
@@ -124,7 +163,7 @@ AgentMessage = (
 )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentDeps:
     """Dependencies injected into all pydantic-ai agents."""
 
@@ -142,10 +181,13 @@ def validate_trade_idea(
     If ok is True but message is not None, it's a warning (opposite-side
     position exists).
     """
+    if not positions:
+        return (True, None)
+    wanted = side.lower()
     for pos in positions.values():
         if pos.symbol != symbol:
             continue
-        if pos.side.lower() == side.lower():
+        if pos.side.lower() == wanted:
             return (
                 False,
                 f"Blocked: already have an open {pos.side} position in "
@@ -163,11 +205,69 @@ def validate_trade_idea(
 
 
 def record_usage(deps: AgentDeps, result: object) -> None:
-    """Record token usage from an agent run result and report to the TUI."""
+    """Record token usage from an agent run result and report to the TUI.
+
+    Reports are debounced: runs finishing within ``TOKEN_REPORT_INTERVAL``
+    of each other share one status-bar update carrying the latest totals.
+    """
+    state = deps.state
     usage = result.usage()
-    deps.state.total_input_tokens += usage.request_tokens or 0
-    deps.state.total_output_tokens += usage.response_tokens or 0
-    send_token_usage(deps.state.total_input_tokens, deps.state.total_output_tokens)
+    state.total_input_tokens += usage.request_tokens or 0
+    state.total_output_tokens += usage.response_tokens or 0
+    if state.token_report is None:
+        state.token_report = asyncio.get_running_loop().call_later(
+            TOKEN_REPORT_INTERVAL, _report_usage, state
+        )
+
+
+def _report_usage(state: SharedState) -> None:
+    """Send the current token totals to the TUI status bar."""
+    state.token_report = None
+    send_token_usage(state.total_input_tokens, state.total_output_tokens)
+
+
+def flush_usage_report(state: SharedState) -> None:
+    """Send a debounced token report now instead of when its timer fires."""
+    if state.token_report is not None:
+        state.token_report.cancel()
+        _report_usage(state)
+
+
+def _message_chars(message: ModelMessage) -> int:
+    """Approximate size of a message's text, tool arguments and results."""
+    size = 0
+    for part in message.parts:
+        if isinstance(part, ToolCallPart):
+            body = part.args
+        else:
+            body = getattr(part, "content", "")
+        size += len(body) if isinstance(body, str) else len(str(body))
+    return size
+
+
+def _starts_turn(message: ModelMessage) -> bool:
+    """Whether history may begin at *message*.
+
+    A replayed history must not open with a model response or with tool
+    results whose originating tool call has been trimmed away.
+    """
+    return isinstance(message, ModelRequest) and not any(
+        isinstance(part, (ToolReturnPart, RetryPromptPart)) for part in message.parts
+    )
+
+
+def trim_history(history: deque, max_tokens: int = HISTORY_MAX_TOKENS) -> None:
+    """Drop the oldest messages until *history* fits *max_tokens*.
+
+    Trimming continues past the budget to the next message that starts a
+    turn, so the remainder is always a valid conversation prefix.
+    """
+    budget = max_tokens * 4
+    total = sum(map(_message_chars, history))
+    while history and total > budget:
+        total -= _message_chars(history.popleft())
+    while history and not _starts_turn(history[0]):
+        history.popleft()
 
 
 async def run_agent_streamed(
@@ -175,20 +275,22 @@ async def run_agent_streamed(
     prompt: str,
     *,
     deps: AgentDeps,
-    history: list | None = None,
-    model: object,
+    history: deque | None = None,
     panel: int,
-) -> list:
+) -> None:
     """Run an agent with streaming output, sending deltas to the TUI.
 
     Each model request node gets its own stream/flush cycle so tool calls
     (which happen between model nodes) appear cleanly between streamed text.
 
-    Returns the (truncated) message history.
+    The history deque (bounded by ``HISTORY_MAX_MESSAGES``) is extended in
+    place with only this run's new messages, then trimmed to
+    ``HISTORY_MAX_TOKENS`` with :func:`trim_history`.
     """
+    messages = list(history) if history is not None else None
     with logfire.span('run_agent_streamed', panel=panel):
         async with agent.iter(
-            prompt, deps=deps, message_history=history, model=model
+            prompt, deps=deps, message_history=messages
         ) as agent_run:
             async for node in agent_run:
                 if isinstance(node, ModelRequestNode):
@@ -197,4 +299,6 @@ async def run_agent_streamed(
                             send_stream_delta(panel, chunk)
                     send_stream_end(panel)
         record_usage(deps, agent_run)
-        return agent_run.all_messages()[-30:]
+        if history is not None:
+            history.extend(agent_run.new_messages())
+            trim_history(history)
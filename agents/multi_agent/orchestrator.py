@@ -13,12 +13,12 @@ Runs 7 concurrent asyncio tasks:
 from __future__ import annotations
 
 import asyncio
-import sys
-import traceback
+import logging
+from collections import deque
 
 import logfire
 
-from multi_agent.bridge import StdinBridge, output_to_panel, send_ready
+from multi_agent.bridge import StdinBridge, flush_tui, output_to_panel, send_ready
 from multi_agent.bus import AgentBus
 from multi_agent.llm import create_model
 from multi_agent.models import (
@@ -27,23 +27,28 @@ from multi_agent.models import (
     ApprovedOrder,
     ClosePosition,
     ConsultMarket,
+    HISTORY_MAX_MESSAGES,
     MarketAnalysis,
     OrderFilled,
     OrderPlaced,
     TickerBroadcast,
     TradeIdea,
     UserRequest,
+    flush_usage_report,
 )
 from multi_agent.state import BalanceInfo, SharedState, TickerSnapshot
 
 from multi_agent.agents import (
     execution_agent,
     ideation_agent,
+    init_agents,
     market_agent,
     risk_agent,
     user_agent,
 )
 
+logger = logging.getLogger(__name__)
+
 # Minimum price change (fraction) to forward ticker to Market Agent
 TICKER_CHANGE_THRESHOLD = 0.001  # 0.1%
 
@@ -60,11 +65,11 @@ async def run(loop: asyncio.AbstractEventLoop) -> None:
         state = SharedState()
         bus = AgentBus()
         bridge = StdinBridge(loop)
-        bridge.start()
+        await bridge.start()
 
-        # Create shared LLM model instance (deferred until runtime so
+        # Bind one shared LLM model to all agents (deferred until runtime so
         # FIREWORKS_API_KEY is available)
-        model = create_model()
+        init_agents(create_model())
 
         # Create per-agent deps with their output panel assignments
         user_deps = AgentDeps(state=state, bus=bus, output_panel=0)
@@ -81,27 +86,27 @@ async def run(loop: asyncio.AbstractEventLoop) -> None:
                 name="route_stdin",
             ),
             asyncio.create_task(
-                _run_user_agent_loop(bus, user_deps, model),
+                _run_user_agent_loop(bus, user_deps),
                 name="user_agent",
             ),
             asyncio.create_task(
-                _run_market_agent_loop(bus, market_deps, model),
+                _run_market_agent_loop(bus, market_deps),
                 name="market_agent",
             ),
             asyncio.create_task(
-                _run_risk_agent_loop(bus, risk_deps, model),
+                _run_risk_agent_loop(bus, risk_deps),
                 name="risk_agent",
             ),
             asyncio.create_task(
-                _run_execution_agent_loop(bus, exec_deps, model),
+                _run_execution_agent_loop(bus, exec_deps),
                 name="execution_agent",
             ),
             asyncio.create_task(
-                _run_risk_monitor(risk_deps, model),
+                _run_risk_monitor(risk_deps),
                 name="risk_monitor",
             ),
             asyncio.create_task(
-                _run_ideation_loop(ideation_deps, model),
+                _run_ideation_loop(ideation_deps),
                 name="ideation_agent",
             ),
         ]
@@ -123,102 +128,164 @@ async def run(loop: asyncio.AbstractEventLoop) -> None:
             for task in tasks:
                 task.cancel()
             await asyncio.gather(*tasks, return_exceptions=True)
+            await ideation_agent.close_client()
+            flush_usage_report(state)
+            flush_tui()
 
 
 async def _route_stdin_messages(
     bridge: StdinBridge, bus: AgentBus, state: SharedState
 ) -> None:
-    """Read from stdin bridge and dispatch to appropriate agents."""
+    """Read from stdin bridge and dispatch to appropriate agents.
+
+    Everything already queued is taken in one batch so a burst of ticker
+    updates is handled in a single pass; only the newest tick per symbol
+    in a batch is applied.
+    """
     while not state.shutting_down:
-        msg = await bridge.recv()
-        if msg is None:
-            break
+        for msg in _coalesce_tickers(await bridge.recv_batch()):
+            if msg is None:
+                return
+            await _dispatch_stdin_message(msg, bus, state)
+            if state.shutting_down:
+                return
 
-        msg_type = msg.get("type")
-        try:
-            if msg_type == "user_message":
-                content = msg.get("content", "")
-                await bus.send(AgentRole.USER, UserRequest(content=content))
 
-            elif msg_type == "ticker_update":
-                data = msg.get("data", {})
+def _coalesce_tickers(batch: list[dict | None]) -> list[dict | None]:
+    """Drop ticker updates superseded by a later one for the same symbol.
+
+    Other messages, and the surviving ticks, keep their relative order.
+    """
+    if len(batch) < 2:
+        return batch
+    seen: set[str] = set()
+    kept: list[dict | None] = []
+    for msg in reversed(batch):
+        if msg is not None and msg.get("type") == "ticker_update":
+            data = msg.get("data")
+            # Malformed ticks are left for the dispatcher to report.
+            if isinstance(data, dict):
                 symbol = data.get("symbol", "")
-                _update_ticker(state, symbol, data)
-                # Only forward to Market if active pair with meaningful change
-                if symbol in state.active_pairs and _price_changed_enough(
-                    state, symbol, data
-                ):
-                    await bus.send(
-                        AgentRole.MARKET, TickerBroadcast(data=data)
-                    )
+                if symbol in seen:
+                    continue
+                seen.add(symbol)
+        kept.append(msg)
+    kept.reverse()
+    return kept
+
 
-            elif msg_type == "execution_update":
-                data = msg.get("data", [])
-                await bus.send(AgentRole.RISK, OrderFilled(data=data))
-
-            elif msg_type == "order_response":
-                await bus.send(
-                    AgentRole.EXECUTION,
-                    OrderPlaced(
-                        symbol="",
-                        side="",
-                        qty="",
-                        success=msg.get("success", False),
-                        order_id=msg.get("order_id"),
-                        error=msg.get("error"),
-                    ),
+async def _dispatch_stdin_message(
+    msg: dict, bus: AgentBus, state: SharedState
+) -> None:
+    """Apply one TUI message to shared state and forward it to agents."""
+    msg_type = msg.get("type")
+    try:
+        if msg_type == "user_message":
+            content = msg.get("content", "")
+            await bus.send(AgentRole.USER, UserRequest(content=content))
+
+        elif msg_type == "ticker_update":
+            data = msg.get("data", {})
+            symbol = data.get("symbol", "")
+            _update_ticker(state, symbol, data)
+            # Only forward to Market if active pair with meaningful change
+            if symbol in state.active_pairs and _price_changed_enough(
+                state, symbol, data
+            ):
+                # A tick still waiting for the Market Agent is stale now.
+                await bus.send_latest(
+                    AgentRole.MARKET, TickerBroadcast(data=data), _broadcast_symbol
                 )
 
-            elif msg_type == "balance_update":
-                for item in msg.get("data", []):
-                    asset = item.get("asset", item.get("name", ""))
-                    balance = item.get("balance", item.get("amount", ""))
-                    state.balances[asset] = BalanceInfo(
-                        asset=asset, balance=str(balance)
-                    )
+        elif msg_type == "execution_update":
+            data = msg.get("data", [])
+            await bus.send(AgentRole.RISK, OrderFilled(data=data))
+
+        elif msg_type == "order_response":
+            await bus.send(
+                AgentRole.EXECUTION,
+                OrderPlaced(
+                    symbol="",
+                    side="",
+                    qty="",
+                    success=msg.get("success", False),
+                    order_id=msg.get("order_id"),
+                    error=msg.get("error"),
+                ),
+            )
 
-            elif msg_type == "active_pairs":
-                state.active_pairs = msg.get("pairs", [])
-                if state.active_pairs:
-                    state.pairs_ready.set()
-                else:
-                    state.pairs_ready.clear()
-                output_to_panel(
-                    0,
-                    f"[system] Active pairs: {', '.join(state.active_pairs) or 'none'}",
+        elif msg_type == "balance_update":
+            for item in msg.get("data", []):
+                asset = item.get("asset", item.get("name", ""))
+                balance = item.get("balance", item.get("amount", ""))
+                state.balances[asset] = BalanceInfo(
+                    asset=asset, balance=str(balance)
                 )
+            state.version += 1
+
+        elif msg_type == "active_pairs":
+            state.active_pairs = msg.get("pairs", [])
+            state.version += 1
+            if state.active_pairs:
+                state.pairs_ready.set()
+            else:
+                state.pairs_ready.clear()
+            output_to_panel(
+                0,
+                f"[system] Active pairs: {', '.join(state.active_pairs) or 'none'}",
+            )
+
+        elif msg_type == "risk_limits":
+            state.risk_limits = msg.get("description", "")
+            state.version += 1
+            output_to_panel(2, f"[risk] Limits updated: {state.risk_limits}")
 
-            elif msg_type == "risk_limits":
-                state.risk_limits = msg.get("description", "")
-                output_to_panel(2, f"[risk] Limits updated: {state.risk_limits}")
+        elif msg_type == "token_state":
+            state.token_state = msg.get("state", "unknown")
+            state.version += 1
+            output_to_panel(0, f"Token state: {state.token_state}")
 
-            elif msg_type == "token_state":
-                state.token_state = msg.get("state", "unknown")
-                output_to_panel(0, f"Token state: {state.token_state}")
+        elif msg_type == "shutdown":
+            output_to_panel(0, "[system] Shutdown requested")
+            state.shutting_down = True
 
-            elif msg_type == "shutdown":
-                output_to_panel(0, "[system] Shutdown requested")
-                state.shutting_down = True
-                break
+    except Exception:
+        logger.exception('failed to handle %s message', msg_type)
 
-        except Exception:
-            traceback.print_exc(file=sys.stderr)
+
+def _broadcast_symbol(msg: TickerBroadcast) -> str:
+    return msg.data.get("symbol", "")
 
 
 def _update_ticker(state: SharedState, symbol: str, data: dict) -> None:
     """Update the shared ticker state from raw data."""
-    state.tickers[symbol] = TickerSnapshot(
-        symbol=symbol,
-        bid=str(data.get("bid", "")),
-        ask=str(data.get("ask", "")),
-        last=str(data.get("last", "")),
-        volume=str(data.get("volume", "")),
-        raw=data,
-    )
+    last = str(data.get("last", ""))
+    snap = state.tickers.get(symbol)
+    if snap is None:
+        state.tickers[symbol] = TickerSnapshot(
+            symbol=symbol,
+            bid=str(data.get("bid", "")),
+            ask=str(data.get("ask", "")),
+            last=last,
+            volume=str(data.get("volume", "")),
+            raw=data,
+        )
+    else:
+        snap.bid = str(data.get("bid", ""))
+        snap.ask = str(data.get("ask", ""))
+        snap.last = last
+        snap.volume = str(data.get("volume", ""))
+        snap.raw = data
     # Update current price on any matching position
+    held = False
     for pos in state.positions.values():
         if pos.symbol == symbol:
-            pos.current_price = str(data.get("last", ""))
+            pos.current_price = last
+            held = True
+    # Agent instructions only show active pairs and open positions, so a
+    # tick for any other symbol leaves the cached renders valid.
+    if held or symbol in state.active_pairs:
+        state.version += 1
 
 
 def _price_changed_enough(
@@ -235,18 +302,17 @@ def _price_changed_enough(
     if last == 0:
         state.last_analyzed_price[symbol] = current
         return True
-    change = abs(current - last) / last
-    if change >= TICKER_CHANGE_THRESHOLD:
+    # Same test as |current - last| / last >= threshold for the positive
+    # prices the exchange reports, without the per-tick division.
+    if abs(current - last) >= last * TICKER_CHANGE_THRESHOLD:
         state.last_analyzed_price[symbol] = current
         return True
     return False
 
 
-async def _run_user_agent_loop(
-    bus: AgentBus, deps: AgentDeps, model: object
-) -> None:
+async def _run_user_agent_loop(bus: AgentBus, deps: AgentDeps) -> None:
     """Process User Agent message queue."""
-    history: list = []
+    history: deque = deque(maxlen=HISTORY_MAX_MESSAGES)
     while not deps.state.shutting_down:
         msg = await bus.recv(AgentRole.USER)
         if deps.state.shutting_down:
@@ -254,20 +320,16 @@ async def _run_user_agent_loop(
         try:
             with logfire.span('agent_loop:{agent}', agent='user', message_type=type(msg).__name__):
                 if isinstance(msg, UserRequest):
-                    history = await user_agent.run_once(
-                        deps, msg.content, history, model=model
-                    )
+                    await user_agent.run_once(deps, msg.content, history)
         except Exception:
             logfire.error('agent error', agent='user', exc_info=True)
-            traceback.print_exc(file=sys.stderr)
+            logger.exception('user agent error')
             output_to_panel(0, "[error] User Agent encountered an error")
 
 
-async def _run_market_agent_loop(
-    bus: AgentBus, deps: AgentDeps, model: object
-) -> None:
+async def _run_market_agent_loop(bus: AgentBus, deps: AgentDeps) -> None:
     """Process Market Agent message queue."""
-    history: list = []
+    history: deque = deque(maxlen=HISTORY_MAX_MESSAGES)
     while not deps.state.shutting_down:
         msg = await bus.recv(AgentRole.MARKET)
         if deps.state.shutting_down:
@@ -275,18 +337,12 @@ async def _run_market_agent_loop(
         try:
             with logfire.span('agent_loop:{agent}', agent='market', message_type=type(msg).__name__):
                 if isinstance(msg, UserRequest):
-                    history = await market_agent.run_on_user_request(
-                        deps, msg, history, model=model
-                    )
+                    await market_agent.run_on_user_request(deps, msg, history)
                 elif isinstance(msg, TickerBroadcast):
                     symbol = msg.data.get("symbol", "")
-                    history = await market_agent.run_on_ticker(
-                        deps, symbol, history, model=model
-                    )
+                    await market_agent.run_on_ticker(deps, symbol, history)
                 elif isinstance(msg, ConsultMarket):
-                    history = await market_agent.run_on_consultation(
-                        deps, msg, history, model=model
-                    )
+                    await market_agent.run_on_consultation(deps, msg, history)
                 elif isinstance(msg, OrderPlaced):
                     # Informational — no LLM call needed
                     status = "filled" if msg.success else f"failed: {msg.error}"
@@ -295,15 +351,13 @@ async def _run_market_agent_loop(
                     )
         except Exception:
             logfire.error('agent error', agent='market', exc_info=True)
-            traceback.print_exc(file=sys.stderr)
+            logger.exception('market agent error')
             output_to_panel(1, "[error] Market Agent encountered an error")
 
 
-async def _run_risk_agent_loop(
-    bus: AgentBus, deps: AgentDeps, model: object
-) -> None:
+async def _run_risk_agent_loop(bus: AgentBus, deps: AgentDeps) -> None:
     """Process Risk Agent message queue."""
-    history: list = []
+    history: deque = deque(maxlen=HISTORY_MAX_MESSAGES)
     while not deps.state.shutting_down:
         msg = await bus.recv(AgentRole.RISK)
         if deps.state.shutting_down:
@@ -311,17 +365,11 @@ async def _run_risk_agent_loop(
         try:
             with logfire.span('agent_loop:{agent}', agent='risk', message_type=type(msg).__name__):
                 if isinstance(msg, TradeIdea):
-                    history = await risk_agent.run_on_trade_idea(
-                        deps, msg, history, model=model
-                    )
+                    await risk_agent.run_on_trade_idea(deps, msg, history)
                 elif isinstance(msg, MarketAnalysis):
-                    history = await risk_agent.run_on_market_analysis(
-                        deps, msg, history, model=model
-                    )
+                    await risk_agent.run_on_market_analysis(deps, msg, history)
                 elif isinstance(msg, OrderFilled):
-                    history = await risk_agent.run_on_execution_update(
-                        deps, msg.data, history, model=model
-                    )
+                    await risk_agent.run_on_execution_update(deps, msg.data, history)
                 elif isinstance(msg, OrderPlaced):
                     if not msg.success:
                         output_to_panel(
@@ -330,13 +378,11 @@ async def _run_risk_agent_loop(
                         )
         except Exception:
             logfire.error('agent error', agent='risk', exc_info=True)
-            traceback.print_exc(file=sys.stderr)
+            logger.exception('risk agent error')
             output_to_panel(2, "[risk] [error] Risk Agent encountered an error")
 
 
-async def _run_execution_agent_loop(
-    bus: AgentBus, deps: AgentDeps, model: object
-) -> None:
+async def _run_execution_agent_loop(bus: AgentBus, deps: AgentDeps) -> None:
     """Process Execution Agent message queue."""
     while not deps.state.shutting_down:
         msg = await bus.recv(AgentRole.EXECUTION)
@@ -345,13 +391,9 @@ async def _run_execution_agent_loop(
         try:
             with logfire.span('agent_loop:{agent}', agent='execution', message_type=type(msg).__name__):
                 if isinstance(msg, ApprovedOrder):
-                    await execution_agent.run_on_approved_order(
-                        deps, msg, model=model
-                    )
+                    await execution_agent.run_on_approved_order(deps, msg)
                 elif isinstance(msg, ClosePosition):
-                    await execution_agent.run_on_close_position(
-                        deps, msg, model=model
-                    )
+                    await execution_agent.run_on_close_position(deps, msg)
                 elif isinstance(msg, OrderPlaced):
                     # Order response from exchange
                     await execution_agent.run_on_order_response(
@@ -363,28 +405,26 @@ async def _run_execution_agent_loop(
                     )
         except Exception:
             logfire.error('agent error', agent='execution', exc_info=True)
-            traceback.print_exc(file=sys.stderr)
+            logger.exception('execution agent error')
             output_to_panel(2, "[exec] [error] Execution Agent encountered an error")
 
 
-async def _run_risk_monitor(deps: AgentDeps, model: object) -> None:
+async def _run_risk_monitor(deps: AgentDeps) -> None:
     """Periodic position review by Risk Agent."""
-    history: list = []
+    history: deque = deque(maxlen=HISTORY_MAX_MESSAGES)
     while not deps.state.shutting_down:
         await asyncio.sleep(RISK_MONITOR_INTERVAL)
         if deps.state.shutting_down:
             break
         try:
             with logfire.span('risk_monitor_cycle'):
-                history = await risk_agent.run_position_review(
-                    deps, history, model=model
-                )
+                await risk_agent.run_position_review(deps, history)
         except Exception:
             logfire.error('risk monitor error', exc_info=True)
-            traceback.print_exc(file=sys.stderr)
+            logger.exception('risk monitor error')
 
 
-async def _run_ideation_loop(deps: AgentDeps, model: object) -> None:
+async def _run_ideation_loop(deps: AgentDeps) -> None:
     """Dual-cadence ideation loop: full OHLC analysis + fast market pulses.
 
     Blocks until at least one trading pair is selected, then runs a full
@@ -393,7 +433,7 @@ async def _run_ideation_loop(deps: AgentDeps, model: object) -> None:
     cached ticker data. Both cadences share the same LLM conversation
     history.
     """
-    history: list = []
+    history: deque = deque(maxlen=HISTORY_MAX_MESSAGES)
     pulse_count = 0
 
     output_to_panel(1, "[ideation] Waiting for pair selection...")
@@ -406,17 +446,13 @@ async def _run_ideation_loop(deps: AgentDeps, model: object) -> None:
             with logfire.span('ideation_cycle', mode=mode):
                 if pulse_count == 0:
                     # Full OHLC analysis
-                    history = await ideation_agent.run_periodic(
-                        deps, history, model=model
-                    )
+                    await ideation_agent.run_periodic(deps, history)
                 else:
                     # Lightweight market pulse check
-                    history = await ideation_agent.run_market_pulse(
-                        deps, history, model=model
-                    )
+                    await ideation_agent.run_market_pulse(deps, history)
         except Exception:
             logfire.error('ideation error', exc_info=True)
-            traceback.print_exc(file=sys.stderr)
+            logger.exception('ideation error')
             output_to_panel(1, "[ideation] [error] Ideation Agent encountered an error")
 
         pulse_count = (pulse_count + 1) % PULSES_PER_FULL_CYCLE
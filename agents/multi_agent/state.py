@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class TickerSnapshot:
-    """Latest price data for a trading pair."""
+    """Latest price data for a trading pair.
+
+    One instance per symbol, overwritten in place on each tick.
+    """
 
     symbol: str
     bid: str
@@ -18,7 +22,7 @@ class TickerSnapshot:
     raw: dict  # full ticker payload from exchange
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Tracked open position."""
 
@@ -30,7 +34,7 @@ class Position:
     unrealized_pnl: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class BalanceInfo:
     """Account balance for a single asset."""
 
@@ -58,3 +62,23 @@ class SharedState:
     # Cumulative token usage across all LLM calls
     total_input_tokens: int = 0
     total_output_tokens: int = 0
+    # Pending debounced token-usage report, if one is scheduled
+    token_report: asyncio.TimerHandle | None = None
+    # Bumped on every mutation of data that agent instructions render
+    # (tickers, positions, balances, risk limits, pairs, token state).
+    version: int = 0
+    _rendered: dict[str, tuple[int, str]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def render_cached(
+        self, key: str, render: Callable[[SharedState], str]
+    ) -> str:
+        """Return ``render(self)``, reusing the last result for *key*
+        until :attr:`version` changes."""
+        cached = self._rendered.get(key)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        text = render(self)
+        self._rendered[key] = (self.version, text)
+        return text
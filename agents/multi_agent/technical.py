@@ -1,43 +1,68 @@
 """Technical analysis indicators — pure Python, no external dependencies.
 
-All functions operate on plain lists. Designed for the ≤720-candle datasets
+All functions operate on plain lists; candles are held column-wise in a
+:class:`CandleSeries`. Designed for the ≤720-candle datasets
 returned by the Kraken OHLC API.
 """
 
 from __future__ import annotations
 
 import math
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable
+from operator import ge, le, sub
 from typing import NamedTuple
 
 
-class Candle(NamedTuple):
-    """Single OHLC candle as returned by Kraken."""
-
-    time: int
-    open: float
-    high: float
-    low: float
-    close: float
-    vwap: float
-    volume: float
-    count: int
-
-
-def parse_candles(raw: list[list]) -> list[Candle]:
-    """Convert Kraken's raw arrays into typed Candle tuples."""
-    return [
-        Candle(
-            time=int(c[0]),
-            open=float(c[1]),
-            high=float(c[2]),
-            low=float(c[3]),
-            close=float(c[4]),
-            vwap=float(c[5]),
-            volume=float(c[6]),
-            count=int(c[7]),
-        )
-        for c in raw
-    ]
+class CandleSeries(NamedTuple):
+    """OHLC candles as returned by Kraken, stored column-wise (oldest first).
+
+    Each indicator reads only the columns it needs, as a contiguous list.
+    """
+
+    time: list[int]
+    open: list[float]
+    high: list[float]
+    low: list[float]
+    close: list[float]
+    vwap: list[float]
+    volume: list[float]
+    count: list[int]
+
+
+def parse_series(raw: list[list]) -> CandleSeries:
+    """Convert Kraken's raw candle arrays into typed columns."""
+    if not raw:
+        return CandleSeries([], [], [], [], [], [], [], [])
+    time, open_, high, low, close, vwap, volume, count = zip(*raw)
+    return CandleSeries(
+        time=list(map(int, time)),
+        open=list(map(float, open_)),
+        high=list(map(float, high)),
+        low=list(map(float, low)),
+        close=list(map(float, close)),
+        vwap=list(map(float, vwap)),
+        volume=list(map(float, volume)),
+        count=list(map(int, count)),
+    )
+
+
+def merge_series(
+    old: CandleSeries, new: CandleSeries, limit: int = 720
+) -> CandleSeries:
+    """Append *new* candles to *old*, keeping the most recent *limit*.
+
+    Candles in *old* at or after the first time in *new* are replaced, so a
+    still-forming candle picks up its final values. If *new* does not
+    overlap *old* the two may not be contiguous, and only *new* is kept.
+    """
+    if not new.time:
+        return old
+    if not old.time or new.time[0] > old.time[-1]:
+        return new
+    cut = bisect_left(old.time, new.time[0])
+    return CandleSeries(*[(o[:cut] + n)[-limit:] for o, n in zip(old, new)])
 
 
 # ---------------------------------------------------------------------------
@@ -47,31 +72,34 @@ def parse_candles(raw: list[list]) -> list[Candle]:
 
 def sma(values: list[float], period: int) -> list[float | None]:
     """Simple Moving Average."""
-    result: list[float | None] = [None] * len(values)
     if period <= 0 or len(values) < period:
-        return result
+        return [None] * len(values)
     window_sum = sum(values[:period])
-    result[period - 1] = window_sum / period
-    for i in range(period, len(values)):
-        window_sum += values[i] - values[i - period]
-        result[i] = window_sum / period
+    result: list[float | None] = [None] * (period - 1)
+    result.append(window_sum / period)
+    append = result.append
+    # Pair each entering value with the one leaving the window.
+    for new, old in zip(values[period:], values):
+        window_sum += new - old
+        append(window_sum / period)
     return result
 
 
 def ema(values: list[float], period: int) -> list[float | None]:
     """Exponential Moving Average."""
-    result: list[float | None] = [None] * len(values)
     if period <= 0 or len(values) < period:
-        return result
+        return [None] * len(values)
     # Seed with SMA of first `period` values
     seed = sum(values[:period]) / period
-    result[period - 1] = seed
     k = 2.0 / (period + 1)
+    decay = 1 - k
+    result: list[float | None] = [None] * (period - 1)
+    result.append(seed)
+    append = result.append
     prev = seed
-    for i in range(period, len(values)):
-        val = values[i] * k + prev * (1 - k)
-        result[i] = val
-        prev = val
+    for value in values[period:]:
+        prev = value * k + prev * decay
+        append(prev)
     return result
 
 
@@ -86,12 +114,10 @@ def rsi(closes: list[float], period: int = 14) -> list[float | None]:
     if period <= 0 or len(closes) < period + 1:
         return result
 
-    gains: list[float] = []
-    losses: list[float] = []
-    for i in range(1, len(closes)):
-        delta = closes[i] - closes[i - 1]
-        gains.append(max(delta, 0.0))
-        losses.append(max(-delta, 0.0))
+    deltas = list(map(sub, closes[1:], closes))
+    # The conditional is several times faster than max(0.0, d) per element.
+    gains = [d if d > 0.0 else 0.0 for d in deltas]  # noqa: FURB136
+    losses = [-d if d < 0.0 else 0.0 for d in deltas]
 
     # Initial averages over first `period` changes
     avg_gain = sum(gains[:period]) / period
@@ -103,14 +129,17 @@ def rsi(closes: list[float], period: int = 14) -> list[float | None]:
         rs = avg_gain / avg_loss
         result[period] = 100.0 - 100.0 / (1.0 + rs)
 
-    for i in range(period, len(gains)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    keep = period - 1
+    i = period + 1
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * keep + gain) / period
+        avg_loss = (avg_loss * keep + loss) / period
         if avg_loss == 0:
-            result[i + 1] = 100.0
+            result[i] = 100.0
         else:
             rs = avg_gain / avg_loss
-            result[i + 1] = 100.0 - 100.0 / (1.0 + rs)
+            result[i] = 100.0 - 100.0 / (1.0 + rs)
+        i += 1
 
     return result
 
@@ -126,23 +155,20 @@ def macd(
     slow_ema = ema(closes, slow)
 
     n = len(closes)
-    macd_line: list[float | None] = [None] * n
-    for i in range(n):
-        if fast_ema[i] is not None and slow_ema[i] is not None:
-            macd_line[i] = fast_ema[i] - slow_ema[i]
-
-    # Compute signal as EMA of non-None MACD values, mapped back
-    macd_values = [(i, v) for i, v in enumerate(macd_line) if v is not None]
-    signal_line: list[float | None] = [None] * n
-    histogram: list[float | None] = [None] * n
-
-    if len(macd_values) >= signal_period:
-        raw = [v for _, v in macd_values]
-        sig = ema(raw, signal_period)
-        for j, (orig_idx, _) in enumerate(macd_values):
-            if sig[j] is not None:
-                signal_line[orig_idx] = sig[j]
-                histogram[orig_idx] = macd_line[orig_idx] - sig[j]  # type: ignore[operator]
+    # Both EMAs are None up to their own warm-up and defined after it, so
+    # the MACD line is defined on one contiguous tail starting here.
+    start = max(fast, slow) - 1
+    if fast <= 0 or slow <= 0 or n <= start:
+        return [None] * n, [None] * n, [None] * n
+
+    tail = list(map(sub, fast_ema[start:], slow_ema[start:]))
+    signal = ema(tail, signal_period)
+    head: list[float | None] = [None] * start
+    macd_line = head + tail
+    signal_line = head + signal
+    histogram = head + [
+        m - s if s is not None else None for m, s in zip(tail, signal)
+    ]
 
     return macd_line, signal_line, histogram
 
@@ -160,40 +186,80 @@ def bollinger_bands(
     n = len(closes)
     upper: list[float | None] = [None] * n
     lower: list[float | None] = [None] * n
-
+    if period <= 0 or n < period:
+        return upper, mid, lower
+    if period == 1:
+        # A one-candle window has zero spread; the rolling sums below would
+        # cancel to rounding noise instead.
+        return list(mid), mid, list(mid)
+
+    # Rolling variance from running sums of x and x², one O(1) update per
+    # candle. Values are taken relative to a close inside the window so the
+    # sums stay small and E[x²] - E[x]² does not cancel catastrophically;
+    # the sums are re-seeded exactly once per window so neither rounding
+    # nor price drift away from that close can build up.
+    sqrt = math.sqrt
     for i in range(period - 1, n):
+        if (i + 1) % period == 0:
+            start = i + 1 - period
+            shift = closes[start]
+            dev = [x - shift for x in closes[start : i + 1]]
+            total = sum(dev)
+            total_sq = sum(d * d for d in dev)
+        else:
+            new = closes[i] - shift
+            old = closes[i - period] - shift
+            total += new - old
+            total_sq += new * new - old * old
+        mean = total / period
+        variance = max(total_sq / period - mean * mean, 0.0)
+        band = num_std * sqrt(variance)
         m = mid[i]
-        if m is None:
-            continue
-        window = closes[i - period + 1 : i + 1]
-        variance = sum((x - m) ** 2 for x in window) / period
-        std = math.sqrt(variance)
-        upper[i] = m + num_std * std
-        lower[i] = m - num_std * std
+        upper[i] = m + band
+        lower[i] = m - band
 
     return upper, mid, lower
 
 
-def atr(candles: list[Candle], period: int = 14) -> list[float | None]:
+def atr(
+    highs: list[float],
+    lows: list[float],
+    closes: list[float],
+    period: int = 14,
+) -> list[float | None]:
     """Average True Range using Wilder's smoothing."""
-    n = len(candles)
+    n = len(closes)
     result: list[float | None] = [None] * n
     if period <= 0 or n < period + 1:
         return result
 
-    true_ranges: list[float] = [candles[0].high - candles[0].low]
-    for i in range(1, n):
-        c = candles[i]
-        prev_close = candles[i - 1].close
-        tr = max(c.high - c.low, abs(c.high - prev_close), abs(c.low - prev_close))
-        true_ranges.append(tr)
+    # True range per candle with scalar compares. Both a 3-argument max()
+    # and max(tr, gap) per gap measure well over twice as slow here.
+    true_ranges: list[float] = [highs[0] - lows[0]]
+    append = true_ranges.append
+    for high, low, prev_close in zip(highs[1:], lows[1:], closes):
+        tr = high - low
+        gap = high - prev_close
+        if gap < 0:
+            gap = -gap
+        if gap > tr:  # noqa: PLR1730
+            tr = gap
+        gap = low - prev_close
+        if gap < 0:
+            gap = -gap
+        if gap > tr:  # noqa: PLR1730
+            tr = gap
+        append(tr)
 
     # Initial ATR is SMA of first `period` TRs
     avg = sum(true_ranges[:period]) / period
     result[period - 1] = avg
-    for i in range(period, n):
-        avg = (avg * (period - 1) + true_ranges[i]) / period
+    keep = period - 1
+    i = period
+    for tr in true_ranges[period:]:
+        avg = (avg * keep + tr) / period
         result[i] = avg
+        i += 1
 
     return result
 
@@ -210,10 +276,11 @@ def volume_sma(volumes: list[float], period: int = 20) -> list[float | None]:
 
 def price_momentum(closes: list[float], period: int = 10) -> list[float | None]:
     """Percentage price change over N candles."""
-    result: list[float | None] = [None] * len(closes)
-    for i in range(period, len(closes)):
-        if closes[i - period] != 0:
-            result[i] = (closes[i] - closes[i - period]) / closes[i - period] * 100.0
+    result: list[float | None] = [None] * min(period, len(closes))
+    result.extend([
+        (now - then) / then * 100.0 if then != 0 else None
+        for then, now in zip(closes, closes[period:])
+    ])
     return result
 
 
@@ -222,8 +289,37 @@ def price_momentum(closes: list[float], period: int = 10) -> list[float | None]:
 # ---------------------------------------------------------------------------
 
 
+def _swing_points(
+    values: list[float],
+    lookback: int,
+    dominated: Callable[[float, float], bool],
+) -> list[float]:
+    """Values that are the window extreme within *lookback* candles each side.
+
+    A sliding-window monotonic deque tracks the extreme, so each index is
+    pushed and popped at most once. *dominated(a, b)* says that an older
+    value *a* can never be the extreme again once *b* has arrived: ``le``
+    finds swing highs, ``ge`` swing lows. Ties count as swings, as with
+    a direct neighbour comparison.
+    """
+    span = 2 * lookback
+    window: deque[int] = deque()
+    points: list[float] = []
+    for i, value in enumerate(values):
+        while window and dominated(values[window[-1]], value):
+            window.pop()
+        window.append(i)
+        if window[0] < i - span:
+            window.popleft()
+        if i >= span:
+            center = values[i - lookback]
+            if center == values[window[0]]:
+                points.append(center)
+    return points
+
+
 def find_key_levels(
-    candles: list[Candle],
+    series: CandleSeries,
     lookback: int = 5,
     tolerance_pct: float = 0.5,
 ) -> dict[str, list[float]]:
@@ -232,21 +328,15 @@ def find_key_levels(
     Returns ``{"support": [...], "resistance": [...]}`` sorted by proximity
     to the current price, at most 3 of each.
     """
-    if len(candles) < 2 * lookback + 1:
+    highs = series.high
+    lows = series.low
+    if len(highs) < 2 * lookback + 1:
         return {"support": [], "resistance": []}
 
-    swing_highs: list[float] = []
-    swing_lows: list[float] = []
+    swing_highs = _swing_points(highs, lookback, le)
+    swing_lows = _swing_points(lows, lookback, ge)
 
-    for i in range(lookback, len(candles) - lookback):
-        high = candles[i].high
-        low = candles[i].low
-        if all(high >= candles[j].high for j in range(i - lookback, i + lookback + 1) if j != i):
-            swing_highs.append(high)
-        if all(low <= candles[j].low for j in range(i - lookback, i + lookback + 1) if j != i):
-            swing_lows.append(low)
-
-    current_price = candles[-1].close
+    current_price = series.close[-1]
 
     def cluster(levels: list[float]) -> list[float]:
         if not levels:
@@ -311,13 +401,13 @@ def _fmt_signed(value: float | None, decimals: int = 1) -> str:
     return f"{value:+.{decimals}f}"
 
 
-def compute_all(candles: list[Candle], interval: int = 60) -> str:
+def compute_all(series: CandleSeries, interval: int = 60) -> str:
     """Run all indicators and return a compact text summary (~300 tokens)."""
-    if len(candles) < 2:
+    closes = series.close
+    if len(closes) < 2:
         return "Insufficient data for technical analysis."
 
-    closes = [c.close for c in candles]
-    volumes = [c.volume for c in candles]
+    volumes = series.volume
     current = closes[-1]
 
     # Trend
@@ -335,60 +425,47 @@ def compute_all(candles: list[Candle], interval: int = 60) -> str:
     bb_upper, bb_mid, bb_lower = bollinger_bands(closes)
 
     # ATR
-    atr_vals = atr(candles, 14)
+    atr_vals = atr(series.high, series.low, closes, 14)
 
     # Volume
     vol_avg = volume_sma(volumes, 20)
 
     # Key levels
-    levels = find_key_levels(candles)
+    levels = find_key_levels(series)
 
     # --- Build output ---
-    lines: list[str] = [f"=== Technical Indicators ({interval}min) ==="]
-
-    # Trend
-    lines.append(
-        f"TREND: EMA(9): {_fmt(ema9[-1])}  EMA(21): {_fmt(ema21[-1])}  "
-        f"Momentum(10): {_fmt_signed(mom[-1])}%"
-    )
-
-    # RSI
+    # Derived pieces first; the summary itself is one f-string.
     rsi_val = rsi_vals[-1]
     rsi_str = f"{_fmt(rsi_val)} ({_rsi_label(rsi_val)})" if rsi_val is not None else "n/a"
-    lines.append(f"RSI(14): {rsi_str}")
 
-    # MACD
     hist_label = _macd_label(hist[-1], hist[-2] if len(hist) >= 2 else None)
-    lines.append(
-        f"MACD: line={_fmt_signed(macd_line[-1])}  signal={_fmt_signed(signal_line[-1])}  "
-        f"histogram={_fmt_signed(hist[-1])} ({hist_label})"
-    )
 
-    # Bollinger
     bb_pos = "n/a"
     if bb_upper[-1] is not None and bb_lower[-1] is not None:
         width = bb_upper[-1] - bb_lower[-1]
         if width > 0:
             bb_pos = f"{(current - bb_lower[-1]) / width * 100:.0f}%"
-    lines.append(
-        f"BOLLINGER(20,2): upper={_fmt(bb_upper[-1])}  mid={_fmt(bb_mid[-1])}  "
-        f"lower={_fmt(bb_lower[-1])}  position={bb_pos}"
-    )
 
-    # ATR
     atr_val = atr_vals[-1]
     atr_pct = f"{atr_val / current * 100:.2f}% of price" if atr_val and current else "n/a"
-    lines.append(f"ATR(14): {_fmt(atr_val)} ({atr_pct})")
 
-    # Volume
     cur_vol = volumes[-1]
     avg_vol = vol_avg[-1]
     rel = f"{cur_vol / avg_vol:.2f}x" if avg_vol else "n/a"
-    lines.append(f"VOLUME: current={_fmt(cur_vol, 2)}  avg(20)={_fmt(avg_vol, 2)}  relative={rel}")
 
-    # Key levels
     r_str = " | ".join(_fmt(lv) for lv in sorted(levels["resistance"])) or "none"
     s_str = " | ".join(_fmt(lv) for lv in sorted(levels["support"])) or "none"
-    lines.append(f"KEY LEVELS: R: {r_str}  S: {s_str}")
 
-    return "\n".join(lines)
+    return (
+        f"=== Technical Indicators ({interval}min) ===\n"
+        f"TREND: EMA(9): {_fmt(ema9[-1])}  EMA(21): {_fmt(ema21[-1])}  "
+        f"Momentum(10): {_fmt_signed(mom[-1])}%\n"
+        f"RSI(14): {rsi_str}\n"
+        f"MACD: line={_fmt_signed(macd_line[-1])}  signal={_fmt_signed(signal_line[-1])}  "
+        f"histogram={_fmt_signed(hist[-1])} ({hist_label})\n"
+        f"BOLLINGER(20,2): upper={_fmt(bb_upper[-1])}  mid={_fmt(bb_mid[-1])}  "
+        f"lower={_fmt(bb_lower[-1])}  position={bb_pos}\n"
+        f"ATR(14): {_fmt(atr_val)} ({atr_pct})\n"
+        f"VOLUME: current={_fmt(cur_vol, 2)}  avg(20)={_fmt(avg_vol, 2)}  relative={rel}\n"
+        f"KEY LEVELS: R: {r_str}  S: {s_str}"
+    )